@@ -1,74 +1,7 @@
 import pandas as pd
 import matplotlib.pyplot as plt
 import numpy as np
-
-# Class definition for scheduling reactors based on available power
-class ReactorScheduler:
-    def __init__(self, num_reactors, interval, max_power):
-        self.num_reactors = num_reactors
-        self.max_power = max_power  # Maximum available power
-        self.reactor_minutes = [0 for _ in range(num_reactors)]  # Track reactor time in minutes
-        self.current_index = 0
-        self.interval = interval  # Set the interval dynamically
-        self.running_reactors = []  # Store the number of running reactors for each interval
-        self.total_energy_consumed = 0  # Total energy consumed by reactors
-    
-    def get_operational_reactors(self, available_power):
-        # Adjust the logic based on the percentage of available power
-        if available_power < 10:
-            return 0
-        elif available_power < 20:
-            return 1
-        elif available_power < 30:
-            return 2
-        elif available_power < 40:
-            return 3
-        elif available_power < 50:
-            return 4
-        elif available_power < 60:
-            return 5
-        elif available_power < 70:
-            return 6
-        elif available_power < 80:
-            return 7
-        elif available_power < 90:
-            return 8
-        elif available_power < 100:  # Correctly set to < 100
-            return 9
-        else:
-            return 10
-    
-    def update_reactor_minutes(self, num_active_reactors):
-        # Power consumption per reactor is 10% of max_power
-        reactor_power_consumption = 0.1 * self.max_power
-        
-        # Energy consumed by the reactors during this interval
-        energy_consumed = num_active_reactors * reactor_power_consumption * (self.interval / 60)
-        self.total_energy_consumed += energy_consumed  # Add to total energy consumed by all reactors
-
-        for i in range(num_active_reactors):
-            reactor_index = (self.current_index + i) % self.num_reactors
-            self.reactor_minutes[reactor_index] += self.interval  # Increment by the adjustable interval
-        self.current_index = (self.current_index + num_active_reactors) % self.num_reactors
-        self.running_reactors.append(num_active_reactors)  # Track the number of running reactors for plotting
-    
-    def schedule_reactors(self, power_readings):
-        # Simulate reactor operation based on the averaged power readings
-        for available_power in power_readings:
-            num_active_reactors = self.get_operational_reactors(available_power)
-            self.update_reactor_minutes(num_active_reactors)
-    
-    def print_reactor_minutes(self):
-        # Print the total minutes each reactor has operated
-        for i, minutes in enumerate(self.reactor_minutes):
-            print(f"Reactor {i+1}: {minutes:.0f} minutes")
-
-    def calculate_efficiency(self, total_solar_power):
-        # Calculate the energy utilization efficiency
-        if total_solar_power == 0:
-            return 0
-        efficiency = self.total_energy_consumed / total_solar_power
-        return efficiency
+from reactor_scheduler import ReactorScheduler, ROUND_ROBIN
 
 # Define the interval (e.g., check every X minutes)
 interval_minutes = 20  # Adjust this value for the desired interval in minutes
@@ -102,7 +35,7 @@ def calculate_efficiency_for_x(x, interval_minutes, resampled_dc_power_kw):
     power_percentages = (resampled_dc_power_kw / max_power) * 100
     
     # Initialize the reactor scheduler with the interval and max power
-    scheduler = ReactorScheduler(10, interval_minutes, max_power)
+    scheduler = ReactorScheduler(10, interval_minutes, max_power, policy=ROUND_ROBIN)
     
     # Schedule reactors based on the resampled power readings
     scheduler.schedule_reactors(power_percentages)
@@ -148,7 +81,7 @@ ax1.tick_params(axis='y', labelcolor='blue')
 ax2 = ax1.twinx()
 
 # Plot the number of running reactors as a line plot
-ax2.plot(resampled_time, best_scheduler.running_reactors, label='Number of Running Reactors', color='orange', linestyle='--')
+ax2.plot(resampled_time, best_scheduler.running_reactors_his, label='Number of Running Reactors', color='orange', linestyle='--')
 
 # Align the scales of both axes
 ax2.set_ylim(0, 1.2 * 10)  # Limit to 0-10 reactors
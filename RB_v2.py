@@ -1,84 +1,7 @@
 import pandas as pd
 import matplotlib.pyplot as plt
 import numpy as np
-
-class ReactorScheduler:
-    def __init__(self, num_reactors, interval, max_power):
-        self.num_reactors = num_reactors
-        self.max_power = max_power  # Maximum available power
-        self.reactor_minutes = [0 for _ in range(num_reactors)]  # Track reactor time in minutes
-        self.interval = interval  # Set the interval dynamically
-        self.running_reactors = set()  # Track currently active reactors by their indices
-        self.total_energy_consumed = 0  # Total energy consumed by reactors
-        self.running_reactors_his = [] # Store the number of running reactors for each interval
-    
-    def get_operational_reactors(self, available_power):
-        """ Adjust the number of reactors to run based on the available power percentage. """
-        if available_power < 10:
-            return 0
-        elif available_power < 20:
-            return 1
-        elif available_power < 30:
-            return 2
-        elif available_power < 40:
-            return 3
-        elif available_power < 50:
-            return 4
-        elif available_power < 60:
-            return 5
-        elif available_power < 70:
-            return 6
-        elif available_power < 80:
-            return 7
-        elif available_power < 90:
-            return 8
-        elif available_power < 100:
-            return 9
-        else:
-            return 10
-
-    def update_reactor_minutes(self, num_active_reactors):
-        reactor_power_consumption = 0.1 * self.max_power  # Power consumption per reactor
-        energy_consumed = num_active_reactors * reactor_power_consumption * (self.interval / 60)
-        self.total_energy_consumed += energy_consumed  # Add energy consumed
-
-        # Sort reactors by runtime, so we activate those with the least runtime
-        reactors_by_runtime = sorted(range(self.num_reactors), key=lambda x: self.reactor_minutes[x])
-        
-        # Determine currently required reactors and adjust activations based on runtime priority
-        if num_active_reactors < len(self.running_reactors):
-            # Deactivate reactors with the most runtime first
-            excess_reactors = sorted(self.running_reactors, key=lambda x: -self.reactor_minutes[x])
-            for reactor_index in excess_reactors[:len(self.running_reactors) - num_active_reactors]:
-                self.running_reactors.remove(reactor_index)
-        
-        elif num_active_reactors > len(self.running_reactors):
-            # Activate reactors with the least runtime first
-            for reactor_index in reactors_by_runtime:
-                if len(self.running_reactors) < num_active_reactors:
-                    self.running_reactors.add(reactor_index)
-
-        # Update runtime for active reactors
-        for reactor_index in self.running_reactors:
-            self.reactor_minutes[reactor_index] += self.interval
-        
-        self.running_reactors_his.append(num_active_reactors)  # Track the number of running reactors for plotting
-
-    def schedule_reactors(self, power_readings):
-        """ Schedule reactors based on available power """
-        for available_power in power_readings:
-            num_active_reactors = self.get_operational_reactors(available_power)
-            self.update_reactor_minutes(num_active_reactors)
-
-    def calculate_efficiency(self, total_solar_power):
-        if total_solar_power == 0:
-            return 0
-        efficiency = self.total_energy_consumed / total_solar_power
-        return efficiency
-    
-    def print_runtime_distribution(self):
-        """ Optional: Print runtime distribution for debugging or analysis """
-        print("Reactor Runtime Distribution:", self.reactor_minutes)
+from reactor_scheduler import ReactorScheduler
 
 # Define the interval (e.g., check every X minutes)
 interval_minutes = 5  # Adjust this value for the desired interval in minutes
@@ -0,0 +1,96 @@
+# csv_writer.py
+#
+# Run as a script, this module is the CSV writer child process: it reads pickled
+# (path, header, rows) jobs from stdin until EOF and reports failed jobs on stdout.
+# The child is started with this file as its entry point rather than through
+# multiprocessing, whose spawn start method (the default on Windows) re-imports main.py
+# in the child and with it every log handler and worker thread the GUI modules set up.
+import csv
+import logging
+import os
+import pickle
+import queue
+import subprocess
+import sys
+import threading
+
+# Failures are reported through the data update worker's log, which owns the handler
+csv_logger = logging.getLogger('data_update_worker')
+
+def _append_rows(path, header, rows):
+    with open(path, mode='a', newline='') as file:
+        writer = csv.writer(file)
+        if file.tell() == 0:  # Add headers if the file is new
+            writer.writerow(header)
+        writer.writerows(rows)
+
+def _serve(jobs, reports):
+    """Child process loop: append each job read from jobs; one failure line per failed job goes to reports."""
+    while True:
+        try:
+            path, header, rows = pickle.load(jobs)
+        except EOFError:  # The parent closed the pipe: everything queued has been written
+            return
+        try:
+            _append_rows(path, header, rows)
+        except Exception as e:
+            # e.g. the file is open in Excel; report it and keep serving the jobs that follow
+            reports.write(f"{len(rows)}\t{path}\t{e!r}\n")
+            reports.flush()
+
+class CsvWriterProcess:
+    """
+    Appends rows to CSV files from a separate process, so formatting and disk I/O
+    never hold the GUI process's interpreter. Jobs are written in the order they were queued.
+    A feeder thread pickles jobs into the child's stdin, so append() never blocks on the pipe.
+    """
+
+    def __init__(self):
+        self.queue = queue.Queue()
+        creationflags = subprocess.CREATE_NO_WINDOW if sys.platform == 'win32' else 0
+        self.process = subprocess.Popen(
+            [sys.executable, os.path.abspath(__file__)],
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+            text=False, creationflags=creationflags
+        )
+        self.feeder = threading.Thread(target=self._feed, name='CsvWriterFeeder', daemon=True)
+        self.feeder.start()
+        self.reporter = threading.Thread(target=self._report_failures, name='CsvWriterReports', daemon=True)
+        self.reporter.start()
+
+    def append(self, path, header, rows):
+        """Queue rows (a list of sequences of plain values) for appending to path."""
+        self.queue.put((path, header, rows))
+
+    def _feed(self):
+        pipe = self.process.stdin
+        for job in iter(self.queue.get, None):
+            try:
+                pickle.dump(job, pipe, protocol=pickle.HIGHEST_PROTOCOL)
+                pipe.flush()
+            except (OSError, ValueError):  # The child has exited; nothing sent from here on is written
+                csv_logger.error("CSV writer process is gone; %d rows for %s were not written", len(job[2]), job[0])
+        try:
+            pipe.close()
+        except OSError:
+            pass
+
+    def _report_failures(self):
+        for line in self.process.stdout:
+            count, path, error = line.decode('utf-8', 'replace').rstrip('\n').split('\t', 2)
+            csv_logger.error("Failed to append %s rows to %s: %s", count, path, error)
+
+    def close(self, timeout=10):
+        """Write everything still queued, then stop the process."""
+        self.queue.put(None)
+        self.feeder.join(timeout)
+        try:
+            self.process.wait(timeout)
+        except subprocess.TimeoutExpired:
+            csv_logger.error("CSV writer did not finish within %s s; %d queued jobs and any rows still in "
+                             "the pipe are lost", timeout, self.queue.qsize())
+            self.process.kill()
+        self.reporter.join(1)
+
+if __name__ == '__main__':
+    _serve(sys.stdin.buffer, sys.stdout)
@@ -1,11 +1,11 @@
 import numpy as np
 import time
-import csv
 import os
 from datetime import datetime
 from PySide6.QtCore import QObject, Signal, QTimer, QThread, QTimer
 import logging
 from logging.handlers import RotatingFileHandler
+from csv_writer import CsvWriterProcess
 
 # Configure a logger for the data update worker with size-based rotation
 data_update_logger = logging.getLogger('data_update_worker')
@@ -20,6 +20,65 @@ data_update_handler.setFormatter(formatter)
 data_update_logger.addHandler(data_update_handler)
 data_update_logger.setLevel(logging.INFO)
 
+def aligned_empty(shape, dtype=np.float32, align=64):
+    """Uninitialized array whose data starts on an `align`-byte boundary (a cache line, and wide enough for AVX-512)."""
+    dtype = np.dtype(dtype)
+    nbytes = int(np.prod(shape)) * dtype.itemsize
+    raw = np.empty(nbytes + align, dtype=np.uint8)
+    offset = -raw.ctypes.data % align
+    return raw[offset:offset + nbytes].view(dtype).reshape(shape)
+
+def aligned_zeros(shape, dtype=np.float32, align=64):
+    """Zero-filled counterpart of aligned_empty."""
+    out = aligned_empty(shape, dtype=dtype, align=align)
+    out.fill(0)
+    return out
+
+class RingBuffer:
+    """Fixed-length history written in place at a moving head instead of shifting on every sample."""
+    __slots__ = ('data', 'head')
+
+    def __init__(self, size, rows=None, dtype=np.float32):
+        # Samples along the last axis, so each row unrolls into one contiguous array; float32 is what pyqtgraph plots
+        self.data = aligned_zeros(size if rows is None else (rows, size), dtype=dtype)
+        self.head = 0  # Slot of the oldest sample, overwritten by the next append
+
+    def append(self, value):
+        """Store one sample (one value per row for a multi-row buffer)."""
+        if self.data.ndim == 1:
+            self.data[self.head] = value  # Plain scalar store, cheaper than the Ellipsis index
+        else:
+            self.data[..., self.head] = value
+        self.head = (self.head + 1) % self.data.shape[-1]
+
+    def extend(self, values):
+        """Store several samples at once; `values` holds them along its last axis, oldest first."""
+        values = np.asarray(values)
+        size = self.data.shape[-1]
+        count = values.shape[-1]
+        if count >= size:
+            self.data[...] = values[..., count - size:]
+            self.head = 0
+            return
+        end = self.head + count
+        if end <= size:
+            self.data[..., self.head:end] = values
+        else:  # Wraps around the end of the buffer
+            split = size - self.head
+            self.data[..., self.head:] = values[..., :split]
+            self.data[..., :end - size] = values[..., split:]
+        self.head = end % size
+
+    def ordered(self):
+        """Return a copy of the history, oldest sample first, in a fresh aligned array."""
+        head = self.head
+        ordered = aligned_empty(self.data.shape, dtype=self.data.dtype)
+        return np.concatenate((self.data[..., head:], self.data[..., :head]), axis=-1, out=ordered)
+
+    def latest(self, count):
+        """Return a copy of the last `count` samples, oldest first."""
+        return self.ordered()[..., -count:]
+
 class DataUpdateWorker(QObject):
     plot_update_signal = Signal(dict)
     stopped = Signal()
@@ -30,15 +89,17 @@ class DataUpdateWorker(QObject):
 
     def __init__(self, pressure_history_size=600, voltage_channels=10, storage_dir="D:\\python\\data"):
         super().__init__()
-        self.pressure_history = np.zeros(pressure_history_size)  # Store 10 minutes of data (600 seconds)
-        self.voltage_data = np.zeros((voltage_channels, pressure_history_size))  # Voltage for multiple channels
-        self.flow_rate = np.zeros(pressure_history_size)  # Store 10 minutes of data (600 seconds)
-        self.ps_current = np.zeros(pressure_history_size)  # Store 10 minutes of data (600 seconds)
-        self.ps_voltage = np.zeros(pressure_history_size)
+        self.pressure_history = RingBuffer(pressure_history_size)  # Store 10 minutes of data (600 seconds)
+        self.voltage_data = RingBuffer(pressure_history_size, rows=voltage_channels)  # Voltage for multiple channels
+        self.flow_rate = RingBuffer(pressure_history_size)  # Store 10 minutes of data (600 seconds)
+        self.ps_current = RingBuffer(pressure_history_size)  # Store 10 minutes of data (600 seconds)
+        self.ps_voltage = RingBuffer(pressure_history_size)
         self.running = True
         self.poll_timer = None
+        self.plot_dirty = False  # Set by every history update, cleared when the plots are refreshed
         self.data_collection = False
         self.time_recording = 5*60*1000  # 5 minutes in milliseconds
+        self.csv_writer = CsvWriterProcess()  # CSV appends run in their own process
 
         # Generate separate filenames with current time prefixes
         self.timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -115,20 +176,24 @@ class DataUpdateWorker(QObject):
         if not self.running:
             self.poll_timer.stop()
             return
+        if not self.plot_dirty:  # Nothing arrived since the last refresh, the plots are current
+            return
+        self.plot_dirty = False
 
+        # Unroll the ring buffers once per update, oldest sample first
         data = {
-            'pressure': self.pressure_history,
-            'voltages': self.voltage_data,
-            'flow_rate': self.flow_rate,
-            'ps_current': self.ps_current,
-            'ps_voltage': self.ps_voltage,
+            'pressure': self.pressure_history.ordered(),
+            'voltages': self.voltage_data.ordered(),
+            'flow_rate': self.flow_rate.ordered(),
+            'ps_current': self.ps_current.ordered(),
+            'ps_voltage': self.ps_voltage.ordered(),
         }
         self.plot_update_signal.emit(data)
 
     def update_pressure(self, pressure, cur_time):
         """Update the pressure history with the new pressure value."""
-        self.pressure_history = np.roll(self.pressure_history, -1)
-        self.pressure_history[-1] = pressure
+        self.pressure_history.append(pressure)
+        self.plot_dirty = True
 
         if self.data_collection:
             # Accumulate time and pressure data
@@ -140,15 +205,19 @@ class DataUpdateWorker(QObject):
                 self.store_data_to_csv("reactor inlet pressure")
 
     def update_voltages(self, voltages, cur_time):
-        """Update the voltage history for multiple channels and store data periodically."""
-        self.voltage_data = np.roll(self.voltage_data, -1, axis=1)
-        self.voltage_data[:, -1] = voltages
-        
+        """Update the voltage history with one sample of every channel; a one-row update_voltages_batch."""
+        self.update_voltages_batch(np.asarray(voltages)[None, :], np.array([cur_time]))
+
+    def update_voltages_batch(self, voltages, times):
+        """Update the voltage history with a (samples, channels) batch and store data periodically."""
+        self.voltage_data.extend(voltages.T)
+        self.plot_dirty = True
+
         if self.data_collection:
             # Accumulate time and voltage data for all channels
-            self.time_data_multichannel_voltage.append(cur_time)
-            self.multichannel_voltage_data.append(voltages.copy())
-            
+            self.time_data_multichannel_voltage.extend(times.tolist())
+            self.multichannel_voltage_data.extend(voltages.tolist())
+
             # Check if we have 10 data points for storage
             if len(self.multichannel_voltage_data) >= 100:
                 self.store_data_to_csv("multichannel_voltage")
@@ -160,7 +229,7 @@ class DataUpdateWorker(QObject):
     def calculate_initial_voltage(self):
         """Add and average the voltages of all channels greater than 1.6V in the past five minutes"""
         # Calculate the average voltage for each channel
-        avg_voltages = np.mean(self.voltage_data[:, -300:], axis=1)
+        avg_voltages = np.mean(self.voltage_data.latest(300), axis=1)
         valid_voltages = avg_voltages[avg_voltages > 1.6]
         if valid_voltages.size > 0:
             initial_voltage = np.mean(valid_voltages)
@@ -174,7 +243,7 @@ class DataUpdateWorker(QObject):
     def update_voltage_change(self):
         """Calculate the voltage change during the electrolysis process every 5 minutes."""
         # Calculate the average voltage for each channel
-        avg_voltages = np.mean(self.voltage_data[:, -300:], axis=1)
+        avg_voltages = np.mean(self.voltage_data.latest(300), axis=1)
         valid_voltages = avg_voltages[avg_voltages > 1.6]
         if valid_voltages.size > 0:
             avg_voltage = np.mean(valid_voltages)
@@ -190,8 +259,8 @@ class DataUpdateWorker(QObject):
 
     def update_flow_rate(self, flow_rate, cur_time):
         """Update the flow rate history with the new flow rate value."""
-        self.flow_rate = np.roll(self.flow_rate, -1)
-        self.flow_rate[-1] = flow_rate
+        self.flow_rate.append(flow_rate)
+        self.plot_dirty = True
 
         if self.data_collection:
             # Accumulate time and flow rate data
@@ -216,8 +285,8 @@ class DataUpdateWorker(QObject):
 
     def update_ps_current(self, current, cur_time):
         """Update the power supply current history with the new current value and store data periodically."""
-        self.ps_current = np.roll(self.ps_current, -1)
-        self.ps_current[-1] = current
+        self.ps_current.append(current)
+        self.plot_dirty = True
         
         if self.data_collection:
             # Accumulate time and current data
@@ -230,8 +299,8 @@ class DataUpdateWorker(QObject):
 
     def update_ps_voltage(self, voltage, cur_time):
         """Update the power supply voltage history with the new voltage value and store data periodically."""
-        self.ps_voltage = np.roll(self.ps_voltage, -1)
-        self.ps_voltage[-1] = voltage
+        self.ps_voltage.append(voltage)
+        self.plot_dirty = True
         
         if self.data_collection:
             # Accumulate time and voltage data
@@ -261,7 +330,7 @@ class DataUpdateWorker(QObject):
         elif data_type == "multichannel_voltage" and self.multichannel_voltage_data:
             # Combine the timestamp with voltage data for 10 channels
             data = [([time] + list(voltage)) for time, voltage in zip(self.time_data_multichannel_voltage, self.multichannel_voltage_data)]
-            header = ['Timestamp'] + [f'Channel_{i+1}' for i in range(self.voltage_data.shape[0])]
+            header = ['Timestamp'] + [f'Channel_{i+1}' for i in range(self.voltage_data.data.shape[0])]
             path = self.multichannel_voltage_path
             self.time_data_multichannel_voltage.clear()
             self.multichannel_voltage_data.clear()
@@ -292,8 +361,8 @@ class DataUpdateWorker(QObject):
             return  # No data to store
 
         # Append data to the specified CSV file
-        with open(path, mode='a', newline='') as file:
-            writer = csv.writer(file)
-            if file.tell() == 0:  # Add headers if the file is new
-                writer.writerow(header)
-            writer.writerows(data)
+        self.csv_writer.append(path, header, data)
+
+    def close_writer(self):
+        """Finish writing queued CSV data and stop the writer process, when the application closes."""
+        self.csv_writer.close()
@@ -1,136 +1,96 @@
-import pandas as pd
 import numpy as np
-from PySide6.QtCore import Qt, QThread, Signal, QObject, QMutex, QElapsedTimer, QMutexLocker, QTimer
-
-class ReactorScheduler:
-    def __init__(self, num_reactors, interval, max_power):
-        self.num_reactors = num_reactors
-        self.max_power = max_power  # Maximum available power
-        self.reactor_minutes = [0 for _ in range(num_reactors)]  # Track reactor time in minutes
-        self.interval = interval  # Set the interval dynamically
-        self.running_reactors = set()  # Track currently active reactors by their indices
-        self.total_energy_consumed = 0  # Total energy consumed by reactors
-        self.running_reactors_his = [] # Store the number of running reactors for each interval
-        self.relays_to_oc = None  # Track the relays to open/close
-        self.V_variation = 1.0  # Voltage variation correction factor
-    
-    def get_operational_reactors(self, available_power):
-        """ Adjust the number of reactors to run based on the available power percentage. """
-        y = 1.205077611 # maxpower ratio of the first day to the current day
-
-        if available_power < 10 * self.V_variation * y:
-            return 0
-        elif available_power < 20 * self.V_variation * y:
-            return 1
-        elif available_power < 30 * self.V_variation * y:
-            return 2
-        elif available_power < 40 * self.V_variation * y:
-            return 3
-        elif available_power < 50 * self.V_variation * y:
-            return 4
-        elif available_power < 60 * self.V_variation * y:
-            return 5
-        elif available_power < 70 * self.V_variation * y:
-            return 6
-        elif available_power < 80 * self.V_variation * y:
-            return 7
-        elif available_power < 90 * self.V_variation * y:
-            return 8
-        elif available_power < 100 * self.V_variation * y:
-            return 9
-        else:
-            return 10
-
-    def update_reactor_minutes(self, num_active_reactors):
-        reactor_power_consumption = 0.1 * self.max_power  # Power consumption per reactor
-        energy_consumed = num_active_reactors * reactor_power_consumption * (self.interval / 60)
-        self.total_energy_consumed += energy_consumed  # Add energy consumed
-
-        # Sort reactors by runtime, so we activate those with the least runtime
-        reactors_by_runtime = sorted(range(self.num_reactors), key=lambda x: self.reactor_minutes[x])
-        
-        # Determine currently required reactors and adjust activations based on runtime priority
-        if num_active_reactors < len(self.running_reactors):
-            # Deactivate reactors with the most runtime first
-            excess_reactors = sorted(self.running_reactors, key=lambda x: -self.reactor_minutes[x])
-            for reactor_index in excess_reactors[:len(self.running_reactors) - num_active_reactors]:
-                self.running_reactors.remove(reactor_index)
-        
-        elif num_active_reactors > len(self.running_reactors):
-            # Activate reactors with the least runtime first
-            for reactor_index in reactors_by_runtime:
-                if len(self.running_reactors) < num_active_reactors:
-                    self.running_reactors.add(reactor_index)
-
-        # Update runtime for active reactors
-        for reactor_index in self.running_reactors:
-            self.reactor_minutes[reactor_index] += self.interval
-        
-        self.running_reactors_his.append(num_active_reactors)  # Track the number of running reactors for plotting
-
-    def schedule_reactors(self, power_readings):
-        """ Schedule reactors based on available power """
-        for available_power in power_readings:
-            num_active_reactors = self.get_operational_reactors(available_power)
-            self.update_reactor_minutes(num_active_reactors)
-
-    def calculate_efficiency(self, total_solar_power):
-        if total_solar_power == 0:
-            return 0
-        efficiency = self.total_energy_consumed / total_solar_power
-        return efficiency
-    
-    def print_runtime_distribution(self):
-        """ Optional: Print runtime distribution for debugging or analysis """
-        print("Reactor Runtime Distribution:", self.reactor_minutes)
-    
-    def schedule_reactors_v2(self, power_readings):
-        """ Schedule reactors based on available power """
-        for available_power in power_readings:
-            num_active_reactors = self.get_operational_reactors(available_power)
-            self.update_reactor_minutes_v2(num_active_reactors)
-        return num_active_reactors
-
-    def update_reactor_minutes_v2(self, num_active_reactors):
-        reactor_power_consumption = 0.1 * self.max_power  # Power consumption per reactor
-        energy_consumed = num_active_reactors * reactor_power_consumption * (self.interval / 60)
-        self.total_energy_consumed += energy_consumed  # Add energy consumed
-        self.relays_to_oc = [0 for _ in range(16)]
-
-        # Sort reactors by runtime, so we activate those with the least runtime
-        reactors_by_runtime = sorted(range(self.num_reactors), key=lambda x: self.reactor_minutes[x])
-        
-        # Determine currently required reactors and adjust activations based on runtime priority
-        if num_active_reactors < len(self.running_reactors):
-            # Deactivate reactors with the most runtime first
-            excess_reactors = sorted(self.running_reactors, key=lambda x: -self.reactor_minutes[x])
-            for reactor_index in excess_reactors[:len(self.running_reactors) - num_active_reactors]:
-                self.running_reactors.remove(reactor_index)
-        
-        elif num_active_reactors > len(self.running_reactors):
-            # Activate reactors with the least runtime first
-            for reactor_index in reactors_by_runtime:
-                if len(self.running_reactors) < num_active_reactors:
-                    self.running_reactors.add(reactor_index)
-
-        # Update runtime for active reactors
-        for reactor_index in self.running_reactors:
-            self.reactor_minutes[reactor_index] += self.interval
-            self.relays_to_oc[reactor_index] = 1
-        
-        self.running_reactors_his.append(num_active_reactors)
-    
-    def modify_V_variation(self, voltage_init, voltage_cur):
-        self.V_variation = voltage_cur / voltage_init
-        return self.V_variation
+from PySide6.QtCore import Qt, QThread, Signal, QObject, QMutex, QMutexLocker, QTimer
+from reactor_scheduler import ReactorScheduler, reactor_indices, operational_reactor_counts
+from solar_data import read_solar_data
+
+MAX_POWER_RATIO = 1.205077611  # maxpower ratio of the first day to the current day
+
+def efficiency_sweep(solar, solar_sum, max_power, x_values, interval_minutes):
+    """ Efficiency of every x in x_values, as one (x, sample) broadcast and a row reduction.
+
+    Energy is linear in the number of running reactors, so no scheduling simulation is needed;
+    NaN samples run all 10 reactors, as in the scheduler. solar_sum is the NaN-aware total of solar.
+    """
+    x_values = np.asarray(x_values, dtype=np.float64)
+    total_solar_power_generated = solar_sum * (interval_minutes / 60)  # Convert to kWh
+    if total_solar_power_generated == 0:
+        return np.zeros(x_values.shape)
+
+    max_powers = max_power / x_values
+    # Whole percents of the ratio-corrected power, mapped through the scheduler's reactor table
+    percents = solar[None, :] * (100.0 / max_powers)[:, None] / MAX_POWER_RATIO
+    n_active = operational_reactor_counts(percents)
+    total_energy = n_active.sum(axis=1) * 0.1 * max_powers * (interval_minutes / 60)
+    return total_energy / total_solar_power_generated
 
 from enum import Enum, auto
+import atexit
+import hashlib
 import logging
-from logging.handlers import RotatingFileHandler
+import os
+import pickle
+import queue
+import threading
+import time
+from logging.handlers import RotatingFileHandler, QueueHandler, QueueListener
+
+class BufferedRotatingFileHandler(RotatingFileHandler):
+    """
+    RotatingFileHandler that writes through a 64 KB buffer. Buffered records reach the file within
+    FLUSH_INTERVAL_S even when no further record arrives; WARNING and above are flushed at once.
+    """
+
+    FLUSH_INTERVAL_S = 1.0
+
+    def __init__(self, *args, **kwargs):
+        self._last_flush = time.monotonic()
+        super().__init__(*args, **kwargs)
+        self._bytes_written = os.path.getsize(self.baseFilename) if os.path.exists(self.baseFilename) else 0
+        # Flushes what is buffered once a second, so a burst followed by a long idle period is not held back
+        self._closed = threading.Event()
+        self._flusher = threading.Thread(target=self._flush_periodically, name='LogFlusher', daemon=True)
+        self._flusher.start()
+
+    def _open(self):
+        return open(self.baseFilename, self.mode, buffering=65536, encoding=self.encoding, errors=self.errors)
+
+    def shouldRollover(self, record):
+        # Track the file size ourselves; the base class seeks the stream, which flushes the buffer
+        if self.stream is None:
+            self.stream = self._open()
+        if self.maxBytes > 0:
+            msg_size = len(("%s\n" % self.format(record)).encode(self.encoding or 'utf-8'))
+            if self._bytes_written + msg_size >= self.maxBytes:
+                self._bytes_written = msg_size  # this record opens the new file
+                return True
+            self._bytes_written += msg_size
+        return False
+
+    def emit(self, record):
+        super().emit(record)
+        if record.levelno >= logging.WARNING:
+            self._flush_now()  # Problems are what a crash must not lose
+
+    def flush(self):
+        # StreamHandler.emit flushes after every record; batch those into one write per interval
+        if time.monotonic() - self._last_flush >= self.FLUSH_INTERVAL_S:
+            self._flush_now()
+
+    def _flush_now(self):
+        self._last_flush = time.monotonic()
+        super().flush()  # Takes the handler lock, so it is safe from the flusher thread
+
+    def _flush_periodically(self):
+        while not self._closed.wait(self.FLUSH_INTERVAL_S):
+            self._flush_now()
+
+    def close(self):
+        self._closed.set()
+        super().close()
 
 # Configure a logger for the interop worker with a rotating file handler
 interop_logger = logging.getLogger('interop_worker')
-interop_handler = RotatingFileHandler(
+interop_handler = BufferedRotatingFileHandler(
     'logs/interop_worker.log', 
     maxBytes=5*1024*1024,
     backupCount=5,
@@ -138,37 +98,31 @@ interop_handler = RotatingFileHandler(
 )
 formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 interop_handler.setFormatter(formatter)
-interop_logger.addHandler(interop_handler)
+# Records are handed to a background listener so file I/O never blocks the worker's event loop
+interop_log_queue = queue.Queue(-1)
+interop_logger.addHandler(QueueHandler(interop_log_queue))
 interop_logger.setLevel(logging.INFO)
+interop_log_listener = QueueListener(interop_log_queue, interop_handler)
+interop_log_listener.start()
+atexit.register(interop_log_listener.stop)
+
+# Gear pump rotate rate and power supply voltage for 0..10 running reactors
+GEARPUMP_ROTATE_RATES = (100, 1500, 1600, 1750, 1900, 2100, 2250, 2450, 2700, 2900, 3000)
+#GEARPUMP_ROTATE_RATES = (0, 20, 40, 60, 80, 100, 120, 140, 160, 180, 200)
+PS_VOLTAGES = (0, 15, 30, 45, 60, 75, 90, 105, 120, 135, 150)
+
+# Resampled solar data and find_best_x results are cached here, keyed by the solar CSV and the interval
+CACHE_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'ten_jrrs')
+# Bump whenever find_best_x's scoring changes (e.g. how power maps to reactor counts) so old results are not reused
+BEST_X_CACHE_VERSION = 2
 
 class WorkerState(Enum):
     IDLE = auto()
     CHECK_TIME = auto()
     PROCESS_INTERVAL = auto()
     
-    # States for closing reactors
-    SET_RELAY_STATE_CLOSE = auto()
-    WAIT_RELAY_STATE_CLOSE = auto()
-    SET_POWER_SUPPLY_CLOSE = auto()
-    WAIT_POWER_SUPPLY_CLOSE = auto()
-    SET_GEARPUMP_RATE_CLOSE = auto()
-    WAIT_GEARPUMP_RATE_CLOSE = auto()
-    CLOSE_SERVO_MOTOR = auto()
-    WAIT_SERVO_MOTOR_CLOSE = auto()
-    DISABLE_TORQUE_CLOSE = auto()
-    WAIT_DISABLE_TORQUE_CLOSE = auto()
-    
-    # States for opening reactors
-    OPEN_SERVO_MOTOR = auto()
-    WAIT_SERVO_MOTOR_OPEN = auto()
-    SET_GEARPUMP_RATE_OPEN = auto()
-    WAIT_GEARPUMP_RATE_OPEN = auto()
-    DISABLE_TORQUE_OPEN = auto()
-    WAIT_DISABLE_TORQUE_OPEN = auto()
-    SET_POWER_SUPPLY_OPEN = auto()
-    WAIT_POWER_SUPPLY_OPEN = auto()
-    SET_RELAY_STATE_OPEN = auto()
-    WAIT_RELAY_STATE_OPEN = auto()
+    # Stepping through a close/open sequence; the step is tracked by the worker
+    RUN_SEQUENCE = auto()
     
     # Final state
     FINISHED = auto()
@@ -177,7 +131,7 @@ class InterOpWorker(QObject):
     solar_data_signal = Signal(float)
     reactor_state_signal = Signal(list)
     efficiency_signal = Signal(float)
-    solar_reactor_signal = Signal(float, list)
+    solar_reactor_signal = Signal(float, int)  # (available power %, running reactor bitmask)
     finished = Signal()
     stopped_signal = Signal()
     reset_signal = Signal()
@@ -198,48 +152,92 @@ class InterOpWorker(QObject):
         self.voltage_cur_avr = None
         self.flag1 = 0  # Indicate whether the reactors have been powered on.
         self.flag2 = 0 # Specially designed for the interruption of fluctuating production processes
+        self.csv_file = csv_file
+        self.scheduler = None  # Created in prepare() on the worker thread
+        self._start_ns = None  # Monotonic anchor of the interval schedule, set in prepare()
+        self._next_k = 0  # Number of intervals served so far
         
-        # Load solar data and initialize scheduler
-        self.solar_data, self.max_power = self.load_solar_data(csv_file, interval_minutes)
-        
-        x_values = np.linspace(1.0, 2.0, 50)
-        self.best_x, self.best_efficiency = self.find_best_x(x_values, interval_minutes)
-        interop_logger.info(f"Best X: {self.best_x}, Best Efficiency: {self.best_efficiency}")
-        print(self.best_x, self.best_efficiency)
-        self.best_x = 1.1020408163265305
-        self.scheduler = ReactorScheduler(10, interval_minutes, self.max_power / self.best_x)
-        self.scheduler.reactor_minutes = [2640, 2670, 2700, 2700, 2640, 2640, 2730, 2730, 2730, 2640]
-        # self.scheduler.running_reactors = {3, 2, 9, 5}
-
-        self.normalized_power = (self.solar_data / (self.max_power / self.best_x)) * 100
         self.relay_state_received = [0 for _ in range(16)]
+        self._pending_close_mask = 0  # Reactors whose servos are closed on the current transition
+        self._pending_open_mask = 0  # Reactors whose servos are opened on the current transition
+        self._awaiting_servos_mask = 0  # Reactors still waiting for a servo acknowledgement
+
+        # Reactor transitions as (action, awaited event) steps; see start_sequence
+        self._close_sequence = (
+            (self.set_relay_state_close, 'relay'),
+            (self.set_power_supply_close, 'voltage'),
+            (self.set_gearpump_rate_close, 'rate'),
+            (self.close_servo_motor, 'servo_close'),
+            (self.disable_torque_close, 'torque_close'),
+        )
+        self._open_sequence = (
+            (self.open_servo_motor, 'servo_open'),
+            (self.set_gearpump_rate_open, 'rate'),
+            (self.disable_torque_open, 'torque_open'),
+            (self.set_power_supply_open, 'voltage'),
+            (self.set_relay_state_open, 'relay'),
+        )
+        self._sequence = ()
+        self._step = 0
+        self._awaited_event = None
         
         # Initialize state machine
         self.state = WorkerState.IDLE
         self.state_timer = None
+        self._state_handlers = {
+            WorkerState.IDLE: self.idle_state,
+            WorkerState.CHECK_TIME: self.check_time_state,
+            WorkerState.PROCESS_INTERVAL: self.process_interval_state,
+            WorkerState.RUN_SEQUENCE: lambda: None,  # steps are advanced by worker callbacks
+            # Final state
+            WorkerState.FINISHED: self.finish_worker,
+        }
         
+        # Interval k is due at _start_ns + first delay + k * interval, so latency never accumulates
+        #self._first_delay_ns = self.interval * 60 * 1_000_000_000  # Initial interval in nanoseconds
+        self._first_delay_ns = 60 * 1_000_000_000
+        self.stopped_signal.connect(self.stop)
+
+    def prepare(self):
+        """Load the solar data, pick x and wire up the device workers; runs on the worker thread."""
+        # Load solar data and initialize scheduler
+        self.solar_data, self.max_power = self.load_solar_data(self.csv_file, self.interval)
+        self._solar_values = np.asarray(self.solar_data, dtype=np.float64)
+        self._solar_sum = float(np.nansum(self._solar_values))  # NaN (empty resample bins) counts as 0
+        
+        x_values = np.linspace(1.0, 2.0, 50)
+        self.best_x, self.best_efficiency = self.load_best_x(self.csv_file, x_values, self.interval)
+        interop_logger.info("Best X: %s, Best Efficiency: %s", self.best_x, self.best_efficiency)
+        print(self.best_x, self.best_efficiency)
+        self.best_x = 1.1020408163265305
+        self.scheduler = ReactorScheduler(10, self.interval, self.max_power / self.best_x,
+                                          power_ratio=MAX_POWER_RATIO)
+        self.scheduler.reactor_minutes = np.array([2640, 2670, 2700, 2700, 2640, 2640, 2730, 2730, 2730, 2640], dtype=np.int64)
+        # self.scheduler.running_reactors = 0b1000101100  # reactors 2, 3, 5, 9
+
+        # Plain ndarray so the per-interval lookups skip pandas indexing
+        self.normalized_power = self._solar_values / (self.max_power / self.best_x) * 100
+
         # Connect signals for asynchronous events
         self.relay_control_worker.interop.connect(self.on_relay_state_changed)
         self.ps_worker.interop.connect(self.on_voltage_set)
         self.gearpump_worker.interop.connect(self.on_rotate_rate_set)
-        self.servo_control_worker.inter_close.connect(self.on_servo_closed)
-        self.servo_control_worker.inter_open.connect(self.on_servo_opened)
-        self.servo_control_worker.tor_open.connect(self.on_torque_disabled_open)
-        self.servo_control_worker.tor_close.connect(self.on_torque_disabled_close)
-        self.stopped_signal.connect(self.stop)
+        self.servo_control_worker.inter_close_batch.connect(self.on_servo_closed)
+        self.servo_control_worker.inter_open_batch.connect(self.on_servo_opened)
+        self.servo_control_worker.tor_open_batch.connect(self.on_torque_disabled_open)
+        self.servo_control_worker.tor_close_batch.connect(self.on_torque_disabled_close)
         # Add connections for opening operations as needed
         
-        # Initialize timer for interval control
-        self.timer = QElapsedTimer()
-        self.timer.start()
+        # Anchor the interval schedule
+        self._start_ns = time.monotonic_ns()
+        self._next_k = 0
 
-        # Initialize target_interval_ms
-        #self.target_interval_ms = self.interval * 60 * 1000  # Initial interval in milliseconds
-        self.target_interval_ms = 60 * 1000
     def run(self):
         """Main execution loop for managing reactor scheduling based on solar data using a state machine."""
+        self.prepare()
         self.state_timer = QTimer()
         self.state_timer.setSingleShot(True)
+        self.state_timer.setTimerType(Qt.PreciseTimer)
         self.state_timer.timeout.connect(self.on_timer_timeout)
         self.running = True
         self.state = WorkerState.CHECK_TIME
@@ -250,41 +248,7 @@ class InterOpWorker(QObject):
         if not self.running:
             self.state = WorkerState.FINISHED
         
-        state_handler = {
-            WorkerState.IDLE: self.idle_state,
-            WorkerState.CHECK_TIME: self.check_time_state,
-            WorkerState.PROCESS_INTERVAL: self.process_interval_state,
-            
-            # Closing reactors
-            WorkerState.SET_RELAY_STATE_CLOSE: self.set_relay_state_close,
-            WorkerState.WAIT_RELAY_STATE_CLOSE: lambda: None,
-            WorkerState.SET_POWER_SUPPLY_CLOSE: self.set_power_supply_close,
-            WorkerState.WAIT_POWER_SUPPLY_CLOSE: lambda: None,
-            WorkerState.SET_GEARPUMP_RATE_CLOSE: self.set_gearpump_rate_close,
-            WorkerState.WAIT_GEARPUMP_RATE_CLOSE: lambda: None,
-            WorkerState.CLOSE_SERVO_MOTOR: self.close_servo_motor,
-            WorkerState.WAIT_SERVO_MOTOR_CLOSE: lambda: None,
-            WorkerState.DISABLE_TORQUE_CLOSE: self.disable_torque_close,
-            WorkerState.WAIT_DISABLE_TORQUE_CLOSE: lambda: None,
-            
-            # Opening reactors
-            WorkerState.OPEN_SERVO_MOTOR: self.open_servo_motor,
-            WorkerState.WAIT_SERVO_MOTOR_OPEN: lambda: None,
-            WorkerState.SET_GEARPUMP_RATE_OPEN: self.set_gearpump_rate_open,
-            WorkerState.WAIT_GEARPUMP_RATE_OPEN: lambda: None,
-            WorkerState.DISABLE_TORQUE_OPEN: self.disable_torque_open,
-            WorkerState.WAIT_DISABLE_TORQUE_OPEN: lambda: None,
-            WorkerState.SET_POWER_SUPPLY_OPEN: self.set_power_supply_open,
-            WorkerState.WAIT_POWER_SUPPLY_OPEN: lambda: None,
-            WorkerState.SET_RELAY_STATE_OPEN: self.set_relay_state_open,
-            WorkerState.WAIT_RELAY_STATE_OPEN: lambda: None,
-            
-            # Final state
-            WorkerState.FINISHED: self.finish_worker,
-        }
-        
-        handler = state_handler.get(self.state, self.unknown_state)
-        handler()
+        self._state_handlers.get(self.state, self.unknown_state)()
     
     def idle_state(self):
         """Handle the IDLE state."""
@@ -300,243 +264,225 @@ class InterOpWorker(QObject):
             self.process_next_state()
             return
         
-        # Calculate elapsed time since the last interval
-        elapsed = self.timer.elapsed()
+        # Compare against the absolute deadline of the next interval
+        now_ns = time.monotonic_ns()
+        deadline_ns = self._start_ns + self._first_delay_ns + self._next_k * self.interval * 60 * 1_000_000_000
         # print the time passed
-        interop_logger.info(f"Time passed: {elapsed} ms")
+        interop_logger.info("Time passed: %s ms", (now_ns - self._start_ns) // 1_000_000)
         
-        if elapsed >= self.target_interval_ms:
-            self.target_interval_ms += self.interval * 60 * 1000  # Schedule next interval
-            #self.target_interval_ms += 60 * 1000
+        if now_ns >= deadline_ns:
+            self._next_k += 1  # Schedule next interval
             self.state = WorkerState.PROCESS_INTERVAL
             self.process_next_state()
         else:
-            # Calculate remaining time and set timer
-            remaining_time = self.target_interval_ms - elapsed
-            interop_logger.info(f"Waiting for {remaining_time} ms until next interval.")
+            # Calculate remaining time (rounded up so the timer never fires early) and set timer
+            remaining_time = -(-(deadline_ns - now_ns) // 1_000_000)
+            interop_logger.info("Waiting for %s ms until next interval.", remaining_time)
             self.state_timer.start(remaining_time)
     
     def process_interval_state(self):
         """Process the reactor scheduling for the current interval."""
-        interop_logger.info(f"{self.scheduler.reactor_minutes}")
-        interop_logger.info(f"{self.scheduler.running_reactors_his}")
-        interop_logger.info(f"{self.scheduler.running_reactors}")
-        available_power = self.normalized_power.iloc[self.index]
-        num_active_reactors_old = len(self.scheduler.running_reactors)
+        interop_logger.info("%s", self.scheduler.reactor_minutes)
+        interop_logger.info("%s", self.scheduler.running_reactors_his)
+        interop_logger.info("%s", reactor_indices(self.scheduler.running_reactors))
+        available_power = self.normalized_power[self.index]
+        num_active_reactors_old = self.scheduler.running_reactors.bit_count()
         num_active_reactors_new = self.scheduler.schedule_reactors_v2([available_power])
         
-        interop_logger.info(f"Interval {self.index}: Available Power = {available_power}, "
-                     f"Old Reactors = {num_active_reactors_old}, New Reactors = {num_active_reactors_new}")
+        interop_logger.info("Interval %d: Available Power = %s, Old Reactors = %d, New Reactors = %d",
+                            self.index, available_power, num_active_reactors_old, num_active_reactors_new)
+
+        # Servos to drive on this transition: every idle reactor is closed, every running one opened
+        self._pending_close_mask = ~self.scheduler.running_reactors & 0x3FF
+        self._pending_open_mask = self.scheduler.running_reactors
         
         if num_active_reactors_new < num_active_reactors_old:
-            self.state = WorkerState.SET_RELAY_STATE_CLOSE
             if self.flag2 == 1:
                 self.flag1 = 1
                 self.flag2 = 0
                 self.first_run_signal.emit()
+            self.start_sequence(self._close_sequence)
         elif num_active_reactors_new > num_active_reactors_old:
-            self.state = WorkerState.OPEN_SERVO_MOTOR
             if self.flag1 == 0:
                 self.flag1 = 1
                 self.first_run_signal.emit()
+            self.start_sequence(self._open_sequence)
         else:
             # No change in reactor states
-            self.solar_reactor_signal.emit(available_power, list(self.scheduler.running_reactors))
-            self.index += 1
-            self.state = WorkerState.CHECK_TIME
             if self.flag2 == 1:
                 self.flag1 = 1
                 self.flag2 = 0
                 self.first_run_signal.emit()
+            self.finish_interval()
+
+    # ------ Reactor transition sequences ------
+    def start_sequence(self, sequence):
+        """Run the (action, awaited event) steps of sequence one after another."""
+        self.state = WorkerState.RUN_SEQUENCE
+        self._sequence = sequence
+        self._step = -1
+        self.advance_step()
+
+    def advance_step(self):
+        """Start the next step of the current sequence, or finish the interval after the last one."""
+        self._step += 1
+        if self._step == len(self._sequence):
+            self._awaited_event = None
+            self.finish_interval()
+            return
+        action, self._awaited_event = self._sequence[self._step]
+        action()
+
+    def on_step_event(self, event):
+        """Advance the sequence if event is the one the current step waits for."""
+        if self.state == WorkerState.RUN_SEQUENCE and self._awaited_event == event:
+            self.advance_step()
+
+    def finish_interval(self):
+        """Report the interval to the GUI and wait for the next one."""
+        available_power = self.normalized_power[self.index]
+        self.solar_reactor_signal.emit(available_power, self.scheduler.running_reactors)
+        self.index += 1
+        self.state = WorkerState.CHECK_TIME
         self.process_next_state()
-    
-    # Closing Reactors States
+
+    def on_servos_acknowledged(self, event, servo_ids):
+        """Tick off acknowledged servos; advance once every servo of the step is done."""
+        if self.state != WorkerState.RUN_SEQUENCE or self._awaited_event != event:
+            return
+        self._awaiting_servos_mask &= ~self.servo_ids_to_mask(servo_ids)
+        if interop_logger.isEnabledFor(logging.DEBUG):
+            interop_logger.debug("%s acknowledged by servos %s. Remaining: %s",
+                                 event, servo_ids, reactor_indices(self._awaiting_servos_mask))
+        if not self._awaiting_servos_mask:
+            self.advance_step()
+
+    @staticmethod
+    def servo_ids_to_mask(servo_ids):
+        """Convert 1-based servo ids to a reactor bitmask."""
+        mask = 0
+        for servo_id in servo_ids:
+            mask |= 1 << (servo_id - 1)
+        return mask
+
+    # Closing Reactors Steps
     def set_relay_state_close(self):
         """Set relay state for closing reactors."""
         relays_to_close = self.scheduler.relays_to_oc
-        interop_logger.debug(f"Setting relay state to close: {relays_to_close}")
+        interop_logger.debug("Setting relay state to close: %s", relays_to_close)
         self.relay_control_worker.button_checked.emit(
             list(range(1, 17)),  # Relay IDs from 1 to 16
             relays_to_close
         )
-        self.state = WorkerState.WAIT_RELAY_STATE_CLOSE
 
     def on_relay_state_changed(self):
         """Handle relay state change for both closing and opening reactors."""
-        if self.state == WorkerState.WAIT_RELAY_STATE_CLOSE:
-            self.state = WorkerState.SET_POWER_SUPPLY_CLOSE
-            self.process_next_state()
-        elif self.state == WorkerState.WAIT_RELAY_STATE_OPEN:
-            available_power = self.normalized_power[self.index]
-            self.solar_reactor_signal.emit(available_power, list(self.scheduler.running_reactors))
-            self.index += 1
-            self.state = WorkerState.CHECK_TIME
-            self.process_next_state()
+        self.on_step_event('relay')
 
     def set_power_supply_close(self):
         """Set power supply voltage for closing reactors."""
-        target_voltage = self.get_ps_voltage(len(self.scheduler.running_reactors))
-        interop_logger.debug(f"Setting power supply voltage to {target_voltage} for closing reactors.")
+        target_voltage = self.get_ps_voltage(self.scheduler.running_reactors.bit_count())
+        interop_logger.debug("Setting power supply voltage to %s for closing reactors.", target_voltage)
         self.ps_worker.button_checked.emit(target_voltage)
-        self.state = WorkerState.WAIT_POWER_SUPPLY_CLOSE
 
     def on_voltage_set(self):
         """Handle power supply voltage set."""
-        if self.state == WorkerState.WAIT_POWER_SUPPLY_CLOSE:
-            self.state = WorkerState.SET_GEARPUMP_RATE_CLOSE
-            self.process_next_state()
-        elif self.state == WorkerState.WAIT_POWER_SUPPLY_OPEN:
-            self.state = WorkerState.SET_RELAY_STATE_OPEN
-            self.process_next_state()
+        self.on_step_event('voltage')
 
     def set_gearpump_rate_close(self):
         """Set gear pump rotate rate for closing reactors."""
-        self.state = WorkerState.WAIT_GEARPUMP_RATE_CLOSE
-        target_rotate_rate = self.get_gearpump_rotate_rate(len(self.scheduler.running_reactors))
-        interop_logger.debug(f"Setting gear pump rotate rate to {target_rotate_rate} for closing reactors.")
+        target_rotate_rate = self.get_gearpump_rotate_rate(self.scheduler.running_reactors.bit_count())
+        interop_logger.debug("Setting gear pump rotate rate to %s for closing reactors.", target_rotate_rate)
         self.gearpump_worker.button_checked.emit(target_rotate_rate)
-        
 
     def on_rotate_rate_set(self):
         """Handle gear pump rotate rate set."""
-        if self.state == WorkerState.WAIT_GEARPUMP_RATE_CLOSE:
-            self.state = WorkerState.CLOSE_SERVO_MOTOR
-            self.process_next_state()
-        elif self.state == WorkerState.WAIT_GEARPUMP_RATE_OPEN:
-            self.state = WorkerState.DISABLE_TORQUE_OPEN
-            self.process_next_state()
+        self.on_step_event('rate')
 
     def close_servo_motor(self):
         """Close the servo motor for reactors to be closed."""
-        reactors_to_close = {id_r for id_r in range(10) if id_r not in self.scheduler.running_reactors}
-        self.reactors_to_close = reactors_to_close.copy()
-        interop_logger.debug(f"Closing servo motors for reactors: {reactors_to_close}")
-        for id_r in reactors_to_close:
-            self.servo_control_worker.button_checked_close.emit(id_r + 1)
-        self.state = WorkerState.WAIT_SERVO_MOTOR_CLOSE
-
-    def on_servo_closed(self, servo_id):
-        """Handle servo motor closed."""
-        if self.state == WorkerState.WAIT_SERVO_MOTOR_CLOSE:
-            reactor_id = servo_id - 1
-            self.reactors_to_close.discard(reactor_id)
-            interop_logger.debug(f"Servo motor closed for reactor {reactor_id}. Remaining to close: {self.reactors_to_close}")
-            if not self.reactors_to_close:
-                self.state = WorkerState.DISABLE_TORQUE_CLOSE
-                self.process_next_state()
+        self._awaiting_servos_mask = self._pending_close_mask
+        reactors_to_close = reactor_indices(self._pending_close_mask)
+        interop_logger.debug("Closing servo motors for reactors: %s", reactors_to_close)
+        self.servo_control_worker.button_checked_close_batch.emit([id_r + 1 for id_r in reactors_to_close])
+
+    def on_servo_closed(self, servo_ids):
+        """Handle servo motors closed."""
+        self.on_servos_acknowledged('servo_close', servo_ids)
 
     def disable_torque_close(self):
         """Disable torque for reactors to be closed."""
-        reactors_to_disable = {id_r for id_r in range(10) if id_r not in self.scheduler.running_reactors}
-        self.reactors_to_distorque_close = reactors_to_disable.copy()
-        interop_logger.debug(f"Disabling torque for reactors: {reactors_to_disable}")
-        for id_r in reactors_to_disable:
-            self.servo_control_worker.button_checked_distorque_close.emit(id_r + 1)
-        self.state = WorkerState.WAIT_DISABLE_TORQUE_CLOSE
-
-    def on_torque_disabled_close(self, servo_id):
+        self._awaiting_servos_mask = self._pending_close_mask
+        reactors_to_disable = reactor_indices(self._pending_close_mask)
+        interop_logger.debug("Disabling torque for reactors: %s", reactors_to_disable)
+        self.servo_control_worker.button_checked_distorque_close_batch.emit([id_r + 1 for id_r in reactors_to_disable])
+
+    def on_torque_disabled_close(self, servo_ids):
         """Handle torque disabled."""
-        if self.state == WorkerState.WAIT_DISABLE_TORQUE_CLOSE:
-            reactor_id = servo_id - 1  # Adjust for 0-based indexing
-            self.reactors_to_distorque_close.discard(reactor_id)
-            interop_logger.debug(f"Torque disabled for reactor {reactor_id}. Remaining to disable: {self.reactors_to_distorque_close}")
-            if not self.reactors_to_distorque_close:
-                # Emit signals to update GUI
-                available_power = self.normalized_power[self.index]
-                self.solar_reactor_signal.emit(available_power, list(self.scheduler.running_reactors))
-                self.index += 1
-                self.state = WorkerState.CHECK_TIME
-                self.process_next_state()
+        self.on_servos_acknowledged('torque_close', servo_ids)
     
-    # Opening Reactors States
+    # Opening Reactors Steps
     def open_servo_motor(self):
         """Open the servo motor for reactors to be opened."""
-        reactors_to_open = self.scheduler.running_reactors.copy()
-        self.reactors_to_open = reactors_to_open.copy()
-        interop_logger.debug(f"Opening servo motors for reactors: {reactors_to_open}")
-        for id_r in reactors_to_open:
-            self.servo_control_worker.button_checked_open.emit(id_r + 1)
-        self.state = WorkerState.WAIT_SERVO_MOTOR_OPEN
-
-    def on_servo_opened(self, servo_id):
-        """Handle servo motor opened."""
-        if self.state == WorkerState.WAIT_SERVO_MOTOR_OPEN:
-            reactor_id = servo_id - 1
-            self.reactors_to_open.discard(reactor_id)
-            interop_logger.debug(f"Servo motor opened for reactor {reactor_id}. Remaining to open: {self.reactors_to_open}")
-            if not self.reactors_to_open:
-                self.state = WorkerState.SET_GEARPUMP_RATE_OPEN
-                self.process_next_state()
+        self._awaiting_servos_mask = self._pending_open_mask
+        reactors_to_open = reactor_indices(self._pending_open_mask)
+        interop_logger.debug("Opening servo motors for reactors: %s", reactors_to_open)
+        self.servo_control_worker.button_checked_open_batch.emit([id_r + 1 for id_r in reactors_to_open])
+
+    def on_servo_opened(self, servo_ids):
+        """Handle servo motors opened."""
+        self.on_servos_acknowledged('servo_open', servo_ids)
 
     def set_gearpump_rate_open(self):
         """Set gear pump rotate rate for opening reactors."""
-        target_rotate_rate = self.get_gearpump_rotate_rate(len(self.scheduler.running_reactors))
-        interop_logger.debug(f"Setting gear pump rotate rate to {target_rotate_rate} for opening reactors.")
+        target_rotate_rate = self.get_gearpump_rotate_rate(self.scheduler.running_reactors.bit_count())
+        interop_logger.debug("Setting gear pump rotate rate to %s for opening reactors.", target_rotate_rate)
         self.gearpump_worker.button_checked.emit(target_rotate_rate)
-        self.state = WorkerState.WAIT_GEARPUMP_RATE_OPEN
 
     def disable_torque_open(self):
         """Disable torque for reactors to be opened."""
-        reactors_to_disable = self.scheduler.running_reactors.copy()
-        self.reactors_to_distorque_open = reactors_to_disable.copy()
-        interop_logger.debug(f"Disabling torque for reactors: {reactors_to_disable}")
-        for id_r in reactors_to_disable:
-            self.servo_control_worker.button_checked_distorque_open.emit(id_r + 1)
-        self.state = WorkerState.WAIT_DISABLE_TORQUE_OPEN
-
-    def on_torque_disabled_open(self, servo_id):
+        self._awaiting_servos_mask = self._pending_open_mask
+        reactors_to_disable = reactor_indices(self._pending_open_mask)
+        interop_logger.debug("Disabling torque for reactors: %s", reactors_to_disable)
+        self.servo_control_worker.button_checked_distorque_open_batch.emit([id_r + 1 for id_r in reactors_to_disable])
+
+    def on_torque_disabled_open(self, servo_ids):
         """Handle torque disabled for opening reactors."""
-        if self.state == WorkerState.WAIT_DISABLE_TORQUE_OPEN:
-            reactor_id = servo_id - 1 # Adjust for 0-based indexing
-            self.reactors_to_distorque_open.discard(reactor_id)
-            interop_logger.debug(f"Torque disabled for reactor {reactor_id}. Remaining to disable: {self.reactors_to_distorque_open}")
-            if not self.reactors_to_distorque_open:
-                    self.state = WorkerState.SET_POWER_SUPPLY_OPEN
-                    self.process_next_state()
+        self.on_servos_acknowledged('torque_open', servo_ids)
 
     def set_power_supply_open(self):
         """Set power supply voltage for opening reactors."""
-        target_voltage = self.get_ps_voltage(len(self.scheduler.running_reactors))
-        interop_logger.debug(f"Setting power supply voltage to {target_voltage} for opening reactors.")
+        target_voltage = self.get_ps_voltage(self.scheduler.running_reactors.bit_count())
+        interop_logger.debug("Setting power supply voltage to %s for opening reactors.", target_voltage)
         self.ps_worker.button_checked.emit(target_voltage)
-        self.state = WorkerState.WAIT_POWER_SUPPLY_OPEN
 
     def set_relay_state_open(self):
         """Set relay state for opening reactors."""
         relays_to_open = self.scheduler.relays_to_oc
-        interop_logger.debug(f"Setting relay state to open: {relays_to_open}")
+        interop_logger.debug("Setting relay state to open: %s", relays_to_open)
         self.relay_control_worker.button_checked.emit(
             list(range(1, 17)),  # Relay IDs from 1 to 16
             relays_to_open
         )
-        self.state = WorkerState.WAIT_RELAY_STATE_OPEN
 
     def on_timer_timeout(self):
         """Handle timer timeout to process the next state."""
-        actual_elapsed = self.timer.elapsed()
-        if actual_elapsed >= self.target_interval_ms:
-            self.target_interval_ms += self.interval * 60 * 1000
-            #self.target_interval_ms += 60 * 1000  # Schedule next interval
-            interop_logger.info("Timer timeout occurred.")
-            self.state = WorkerState.PROCESS_INTERVAL
-            self.process_next_state()
-        else:
-            remaining_time = self.target_interval_ms - actual_elapsed
-            interop_logger.info(f"Timer timeout occurred early. Waiting for {remaining_time} ms.")
-            self.state_timer.start(remaining_time)
+        interop_logger.info("Timer timeout occurred.")
+        self.state = WorkerState.CHECK_TIME
+        self.process_next_state()
 
     def finish_worker(self):
         """Handle the FINISHED state."""
         interop_logger.info("Worker has finished processing all intervals.")
-        interop_logger.info(f"{self.scheduler.reactor_minutes}")
-        interop_logger.info(f"{self.scheduler.running_reactors_his}")
-        interop_logger.info(f"{self.best_x}")
+        interop_logger.info("%s", self.scheduler.reactor_minutes)
+        interop_logger.info("%s", self.scheduler.running_reactors_his)
+        interop_logger.info("%s", self.best_x)
         self.scheduler.print_runtime_distribution()
         self.finished.emit()
 
     def unknown_state(self):
         """Handle unknown states."""
-        interop_logger.error(f"Encountered unknown state: {self.state}")
+        interop_logger.error("Encountered unknown state: %s", self.state)
         self.finished.emit()
 
     def stop(self):
@@ -551,53 +497,109 @@ class InterOpWorker(QObject):
     def process_voltage_variation(self, voltage):
         if self.voltage_init is None:
             self.voltage_init = voltage
-            interop_logger.info(f"Initial voltage: {self.voltage_init}")
+            interop_logger.info("Initial voltage: %s", self.voltage_init)
         else:
             factor = self.scheduler.modify_V_variation(self.voltage_init, voltage)
-            interop_logger.info(f"Voltage variation correction factor: {factor}")
+            interop_logger.info("Voltage variation correction factor: %s", factor)
     
     # Placeholder implementations for required methods
     def load_solar_data(self, filepath, interval_minutes):
-        """Loads and resamples solar data from a CSV file."""
-        data = pd.read_csv(filepath)
-        data['TIMESTAMP'] = pd.to_datetime(data['TIMESTAMP'])
-        data.set_index('TIMESTAMP', inplace=True)
-        resampled_data = data.resample(f'{interval_minutes}min').mean()
-        resampled_data.reset_index(inplace=True)
-        max_power = resampled_data['InvPDC_kW_Avg'].max()
-        return resampled_data['InvPDC_kW_Avg'], max_power
+        """Loads and resamples solar data from a CSV file, reusing the resampled data of a previous launch."""
+        try:
+            key = hashlib.sha1(f"{os.path.abspath(filepath)}:{os.path.getmtime(filepath)}:{interval_minutes}"
+                               .encode()).hexdigest()
+            cache_file = os.path.join(CACHE_DIR, f"solar_{key}.npz")
+        except OSError:
+            return read_solar_data(filepath, interval_minutes)  # let pandas report the missing file
+
+        try:
+            with np.load(cache_file) as cached:
+                interop_logger.info("Loaded solar data from cache %s", cache_file)
+                return cached['power'], float(cached['max_power'])
+        except (OSError, ValueError, KeyError):
+            pass
+
+        power, max_power = read_solar_data(filepath, interval_minutes)
+        try:
+            os.makedirs(CACHE_DIR, exist_ok=True)
+            with open(cache_file + '.tmp', 'wb') as f:
+                np.savez(f, power=power, max_power=max_power)
+            os.replace(cache_file + '.tmp', cache_file)  # never leave a half-written cache behind
+        except OSError as e:
+            interop_logger.warning("Cannot write solar data cache %s: %s", cache_file, e)
+        return power, max_power
 
     def calculate_efficiency_for_x(self, x, interval_minutes):
         """Calculates efficiency for a given x value by adjusting the max power."""
-        max_power = self.max_power / x
-        power_percentages = (self.solar_data / max_power) * 100
-
-        scheduler = ReactorScheduler(10, interval_minutes, max_power)
-        scheduler.schedule_reactors(power_percentages)
-
-        total_solar_power_generated = self.solar_data.sum() * (interval_minutes / 60)  # Convert to kWh
-        efficiency = scheduler.calculate_efficiency(total_solar_power_generated)
-        return efficiency
+        return float(efficiency_sweep(self._solar_values, self._solar_sum, self.max_power, [x],
+                                      interval_minutes)[0])
+
+    def load_best_x(self, csv_file, x_values, interval_minutes):
+        """Returns find_best_x for these inputs, reusing the on-disk result of a previous launch."""
+        try:
+            digest = hashlib.sha256()
+            with open(csv_file, 'rb') as f:
+                digest.update(f.read())
+            digest.update(np.asarray(x_values, dtype=np.float64).tobytes())
+            # The result also depends on the hand-tuned ratio and the scoring rules, not only the inputs
+            digest.update(np.float64(MAX_POWER_RATIO).tobytes())
+            digest.update(BEST_X_CACHE_VERSION.to_bytes(4, 'little'))
+            cache_file = os.path.join(CACHE_DIR, f"bestx_exact_{digest.hexdigest()}_{interval_minutes}.pkl")
+        except OSError as e:
+            interop_logger.warning("Cannot hash %s for the best x cache: %s", csv_file, e)
+            return self.find_best_x(x_values, interval_minutes)
+
+        try:
+            with open(cache_file, 'rb') as f:
+                best_x, best_efficiency = pickle.load(f)
+            interop_logger.info("Loaded best x from cache %s", cache_file)
+            return best_x, best_efficiency
+        except (OSError, pickle.UnpicklingError, EOFError, ValueError, TypeError):
+            pass
+
+        best_x, best_efficiency = self.find_best_x(x_values, interval_minutes)
+        try:
+            os.makedirs(CACHE_DIR, exist_ok=True)
+            with open(cache_file, 'wb') as f:
+                pickle.dump((best_x, best_efficiency), f)
+        except OSError as e:
+            interop_logger.warning("Cannot write best x cache %s: %s", cache_file, e)
+        return best_x, best_efficiency
 
     def find_best_x(self, x_values, interval_minutes):
-        """Finds the best x value that maximizes efficiency."""
-        best_efficiency = 0
-        best_x = None
-        for x in x_values:
-            efficiency = self.calculate_efficiency_for_x(x, interval_minutes)
-            if efficiency > best_efficiency:
-                best_efficiency = efficiency
-                best_x = x
-        return best_x, best_efficiency
+        """Finds the x between min(x_values) and max(x_values) that maximizes efficiency."""
+        x_values = np.asarray(x_values, dtype=np.float64)
+        if x_values.size == 0 or self._solar_sum == 0:
+            return None, 0
+        lo, hi = float(x_values.min()), float(x_values.max())
+
+        # A sample's reactor count goes up by one each time its ratio-corrected power crosses a 10%
+        # step, i.e. at x = k * max_power * MAX_POWER_RATIO / (10 * solar) for k = 1..10. Between
+        # these breakpoints the counts are flat while the power per reactor falls like 1/x, so the
+        # optimum is lo or one of the breakpoints in (lo, hi].
+        solar = self._solar_values[self._solar_values > 0]  # NaN and idle samples never cross a step
+        breakpoints = np.arange(1, 11)[:, None] * (self.max_power * MAX_POWER_RATIO / 10) / solar[None, :]
+        candidates = np.concatenate(([lo], np.sort(breakpoints[(breakpoints > lo) & (breakpoints <= hi)])))
+
+        # Total reactor count at each candidate: the count at lo plus one per breakpoint crossed.
+        # efficiency = count * 0.1 * (max_power / x) * (interval / 60) / (solar_sum * interval / 60)
+        percents = self._solar_values * (100.0 * lo / self.max_power) / MAX_POWER_RATIO
+        counts_at_lo = operational_reactor_counts(percents)  # NaN samples run 10 at every x
+        total_counts = int(counts_at_lo.sum(dtype=np.int64)) + np.arange(candidates.size)
+        efficiencies = total_counts * (0.1 * self.max_power / self._solar_sum) / candidates
+
+        best = int(np.argmax(efficiencies))
+        if efficiencies[best] <= 0:
+            return None, 0
+        # Step just past the breakpoint so the rounding in the per-x evaluation sees the new count
+        best_x = lo if best == 0 else min(float(candidates[best]) * (1 + 1e-9), hi)
+        return best_x, self.calculate_efficiency_for_x(best_x, interval_minutes)
 
     def get_gearpump_rotate_rate(self, num_active_reactors):
         """Get the rotate rate of the gear pump."""
-        rotate_rates = {0: 100, 1: 1500, 2: 1600, 3: 1750, 4: 1900, 5: 2100, 6: 2250, 7: 2450, 8: 2700, 9: 2900, 10: 3000}
-        #rotate_rates = {0: 0, 1: 20, 2: 40, 3: 60, 4: 80, 5: 100, 6: 120, 7: 140, 8: 160, 9: 180, 10: 200}
-        return rotate_rates[num_active_reactors]
+        return GEARPUMP_ROTATE_RATES[num_active_reactors]
 
     def get_ps_voltage(self, num_active_reactors):
         """Get the voltage of the power supply."""
-        voltages = {0: 0, 1: 15, 2: 30, 3: 45, 4: 60, 5: 75, 6: 90, 7: 105, 8: 120, 9: 135, 10: 150}
-        return voltages[num_active_reactors]
+        return PS_VOLTAGES[num_active_reactors]
 
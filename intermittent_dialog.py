@@ -1,9 +1,17 @@
 # intermittent_dialog.py
+import numpy as np
 import pyqtgraph as pg
 from PySide6.QtWidgets import QDialog, QVBoxLayout
 
+try:
+    import OpenGL  # noqa: F401  PyOpenGL is what pyqtgraph draws curves with on an OpenGL viewport
+    OPENGL_AVAILABLE = True
+except ImportError:
+    OPENGL_AVAILABLE = False
+
 class IntermittentOperationDialog(QDialog):
-    def __init__(self, interval_minutes):
+    def __init__(self, interval_minutes, use_opengl=True):
+        """Pass use_opengl=False on platforms where the OpenGL viewport draws slower than the raster one."""
         super().__init__()
 
         # Setup dialog window properties
@@ -27,21 +35,60 @@ class IntermittentOperationDialog(QDialog):
         self.reactor_curve = self.plot_widget_reactors.plot(pen="r")  # Red line for reactors
         layout.addWidget(self.plot_widget_reactors)
 
+        # Draw the curves on the GPU when PyOpenGL is installed
+        if use_opengl and OPENGL_AVAILABLE:
+            pg.setConfigOption('enableExperimental', True)  # Only takes effect on OpenGL viewports
+            self.plot_widget_power.useOpenGL(True)
+            self.plot_widget_reactors.useOpenGL(True)
+
+        # Fixed y ranges: no bounding-box recompute on every setData, no mouse panning
+        self.plot_widget_reactors.setYRange(0, 10, padding=0)
+        for widget in (self.plot_widget_power, self.plot_widget_reactors):
+            widget.enableAutoRange('y', False)
+            widget.setMouseEnabled(x=False, y=False)
+            widget.setAntialiasing(False)
+
+        # Long runs are reduced to roughly one point per pixel, only for the visible x range
+        for curve in (self.power_curve, self.reactor_curve):
+            curve.setDownsampling(auto=True, method='peak')
+            curve.setClipToView(True)
+
         # Set the layout for the dialog
         self.setLayout(layout)
 
-        # Data storage for plotting
-        self.time_data = []
-        self.dc_power_data = []
-        self.reactor_data = []
+        # Data storage for plotting; preallocated and doubled when full
+        self.reset_data()
+
+    def reset_data(self, capacity=4096):
+        """Clear the plotted data."""
+        self.time_data = np.empty(capacity, dtype=np.float32)
+        self.dc_power_data = np.empty(capacity, dtype=np.float32)
+        self.reactor_data = np.empty(capacity, dtype=np.float32)
+        self.num_points = 0
+        self.all_finite = True  # Lets setData skip its NaN scan until a gap in the solar data shows up
+        self.power_top = 100.0  # Upper bound of the power axis, raised only when a sample exceeds it
+        self.plot_widget_power.setYRange(0, self.power_top, padding=0)
 
     def update_plots(self, time_step, available_power, running_reactors):
         """Update the plots with new data."""
+        n = self.num_points
+        if n == len(self.time_data):
+            self.time_data = np.resize(self.time_data, 2 * n)
+            self.dc_power_data = np.resize(self.dc_power_data, 2 * n)
+            self.reactor_data = np.resize(self.reactor_data, 2 * n)
+
         # Append new data
-        self.time_data.append(time_step)
-        self.dc_power_data.append(available_power)
-        self.reactor_data.append(running_reactors)
+        self.time_data[n] = time_step
+        self.dc_power_data[n] = available_power
+        self.reactor_data[n] = running_reactors
+        self.num_points = n + 1
+        if self.all_finite and not np.isfinite(available_power):
+            self.all_finite = False
+        elif available_power > self.power_top:  # Oversized arrays (best x > 1) go past 100 %
+            self.power_top = available_power
+            self.plot_widget_power.setYRange(0, self.power_top, padding=0)
 
-        # Update plot curves
-        self.power_curve.setData(self.time_data, self.dc_power_data)
-        self.reactor_curve.setData(self.time_data, self.reactor_data)
+        # Update plot curves with views of the filled part
+        options = {'skipFiniteCheck': True, 'connect': 'all'} if self.all_finite else {'skipFiniteCheck': False, 'connect': 'finite'}
+        self.power_curve.setData(self.time_data[:n + 1], self.dc_power_data[:n + 1], **options)
+        self.reactor_curve.setData(self.time_data[:n + 1], self.reactor_data[:n + 1], **options)
@@ -1,9 +1,23 @@
-from PySide6.QtCore import QThread, Signal
+from PySide6.QtCore import QObject, QTimer, Signal, QMutexLocker
 import serial
 import struct
+import sys
 import time
 import logging
+from array import array
 from logging.handlers import RotatingFileHandler
+from modbus_bus import ModbusBus
+
+try:
+    from fastcrc import crc16 as _fast_crc16
+except ImportError:  # fastcrc is optional, fall back to the lookup tables below
+    _fast_crc16 = None
+
+try:
+    import numpy as np
+    from numba import njit
+except ImportError:  # numba is optional, long buffers then use the slicing-by-4 tables
+    njit = None
 
 # Configure a logger for the leakage sensor with size-based rotation
 leakage_logger = logging.getLogger("LeakageSensor")
@@ -18,108 +32,235 @@ leakage_handler.setFormatter(formatter)
 leakage_logger.addHandler(leakage_handler)
 leakage_logger.setLevel(logging.INFO)
 
+REPLY_TIMEOUT = 0.15  # Seconds a blocking recv() waits for the complete reply
+REPLY_POLL_INTERVAL = 0.002  # Sleep between in_waiting checks while the reply is still arriving
+
+_REQUEST_HEAD = struct.Struct('>BBHH')  # slave address, function code, start address, register count
+_U16_LE = struct.Struct('<H')  # CRC, low byte first
+
+# Use the 16-entry nibble table (two lookups per byte) instead of the 256-entry byte table,
+# for when the table footprint matters more than speed
+USE_SMALL_TABLE = False
+
+def _crc16_table(bits):
+    """Lookup table for the MODBUS CRC-16 (reflected polynomial 0xA001), indexed by `bits` input bits."""
+    table = []
+    for index in range(1 << bits):
+        crc = index
+        for _ in range(bits):
+            if crc & 0x0001:
+                crc = (crc >> 1) ^ 0xA001
+            else:
+                crc >>= 1
+        table.append(crc)
+    return tuple(table)
+
+_CRC16_TABLE = _crc16_table(8)
+_CRC16_NIBBLE = _crc16_table(4)
+
+def _crc16_slice_tables():
+    """Slicing-by-4 tables: entry k holds the CRC of each byte value followed by k zero bytes."""
+    tables = [_CRC16_TABLE]
+    for _ in range(3):
+        tables.append(tuple((crc >> 8) ^ _CRC16_TABLE[crc & 0xFF] for crc in tables[-1]))
+    return tuple(tables)
+
+_CRC16_SLICE4 = _crc16_slice_tables()
+SLICE4_MIN_LEN = 64  # below this the per-word bookkeeping costs more than it saves in Python
+
+def _crc16_slicing4(data):
+    """Slicing-by-4 CRC: four independent table lookups per 4-byte word, byte table for the tail."""
+    t0, t1, t2, t3 = _CRC16_SLICE4
+    crc = 0xFFFF
+    words_end = len(data) & ~3
+    for i in range(0, words_end, 4):
+        crc ^= data[i] | (data[i + 1] << 8)
+        crc = t3[crc & 0xFF] ^ t2[crc >> 8] ^ t1[data[i + 2]] ^ t0[data[i + 3]]
+    for pos in data[words_end:]:
+        crc = (crc >> 8) ^ t0[(crc ^ pos) & 0xFF]
+    return crc
+
+if njit is not None:
+    _CRC16_TABLE_NP = np.array(_CRC16_TABLE, dtype=np.uint16)
+
+    @njit(cache=True)
+    def _crc16_kernel(data, table):
+        crc = 0xFFFF
+        for i in range(data.shape[0]):
+            crc = (crc >> 8) ^ table[(crc ^ data[i]) & 0xFF]
+        return crc
+
+    def _crc16_numba(data):
+        """Byte-table CRC compiled by numba; data is any bytes-like object."""
+        return int(_crc16_kernel(np.frombuffer(data, dtype=np.uint8), _CRC16_TABLE_NP))
+
+    _crc16_numba(b'\x00')  # Compile (or load the cached build) now rather than on the first poll
+    NUMBA_MIN_LEN = 16  # Below this the call into the compiled kernel costs more than the Python loop
+else:
+    _crc16_numba = None
+
+def _crc16_bytewise(data):
+    if _crc16_numba is not None and len(data) >= NUMBA_MIN_LEN:
+        return _crc16_numba(data)
+    if len(data) >= SLICE4_MIN_LEN:
+        return _crc16_slicing4(data)
+    crc = 0xFFFF
+    for pos in data:
+        crc = (crc >> 8) ^ _CRC16_TABLE[(crc ^ pos) & 0xFF]
+    return crc
+
+def _crc16_nibblewise(data):
+    crc = 0xFFFF
+    for pos in data:
+        crc = (crc >> 4) ^ _CRC16_NIBBLE[(crc ^ pos) & 0x0F]  # low nibble first (reflected CRC)
+        crc = (crc >> 4) ^ _CRC16_NIBBLE[(crc ^ (pos >> 4)) & 0x0F]
+    return crc
+
 class LeakageSensor:
-    def __init__(self, port='/dev/tty.usbserial-120', baudrate=9600, address=1):
+    def __init__(self, port='/dev/tty.usbserial-120', baudrate=9600, address=1, bus=None):
         """
         Initialize the leakage sensor with port, baud rate, and MODBUS address.
+        Pass a shared ModbusBus as `bus` when other slaves sit on the same RS-485 line;
+        port and baudrate are then taken from the bus.
         """
-        self.port = port
-        self.baudrate = baudrate
+        self.bus = bus if bus is not None else ModbusBus(port, baudrate)
+        self.port = self.bus.port
+        self.baudrate = self.bus.baudrate
         self.address = address  # MODBUS address of the device
-        self.ser = None
+        self._request_buf = bytearray(_REQUEST_HEAD.size + _U16_LE.size)  # Reused for every request frame
+        # The status poll never changes, so its frame (CRC included) is built once
+        self._leak_frame = bytes(self.build_modbus_request(0x04, 0x0000, 1))
         leakage_logger.info(
             "Initialized LeakageSensor with port=%s, baudrate=%d, address=%d",
             self.port, self.baudrate, self.address
         )
 
+    @property
+    def ser(self):
+        """The bus's serial port, None until it is opened."""
+        return self.bus.ser
+
     def open_connection(self):
-        """Open the serial connection to the sensor."""
+        """Open the serial connection to the sensor (a no-op if another slave opened the bus)."""
+        if self.bus.is_open:
+            return
         try:
-            self.ser = serial.Serial(
-                port=self.port,
-                baudrate=self.baudrate,
-                parity=serial.PARITY_NONE,
-                stopbits=serial.STOPBITS_ONE,
-                bytesize=serial.EIGHTBITS,
-                timeout=1  # Timeout for the serial read
-            )
+            self.bus.open()
             leakage_logger.info("Opened serial connection on %s with baudrate %d", self.port, self.baudrate)
         except serial.SerialException as e:
             leakage_logger.error("Failed to open serial connection on %s: %s", self.port, str(e))
             raise
 
     def close_connection(self):
-        """Close the serial connection."""
-        if self.ser and self.ser.is_open:
-            self.ser.close()
+        """Close the serial connection, for every slave sharing the bus."""
+        if self.bus.is_open:
+            self.bus.close()
             leakage_logger.info("Closed serial connection on %s", self.port)
 
-    def crc16(self, data: bytes):
-        """Calculate the CRC-16 for the MODBUS RTU protocol."""
-        crc = 0xFFFF
-        for pos in data:
-            crc ^= pos
-            for _ in range(8):
-                if (crc & 0x0001):
-                    crc >>= 1
-                    crc ^= 0xA001
-                else:
-                    crc >>= 1
-        return crc
+    # Calculate the CRC-16 for the MODBUS RTU protocol: crc16(data: bytes) -> int
+    if _fast_crc16 is not None:
+        # native implementation, same value as the tables; it only accepts bytes
+        crc16 = staticmethod(lambda data: _fast_crc16.modbus(data if type(data) is bytes else bytes(data)))
+    else:
+        crc16 = staticmethod(_crc16_nibblewise if USE_SMALL_TABLE else _crc16_bytewise)
 
     def build_modbus_request(self, function_code, start_address, register_count):
         """
         Build the MODBUS RTU request for reading input registers (function=0x04) 
         or any other function code if extended in future.
+        The frame is written into a buffer owned by the sensor, so it is only valid until the next call.
         """
-        request = struct.pack('>B', self.address)       # Slave address
-        request += struct.pack('>B', function_code)     # Function code
-        request += struct.pack('>H', start_address)     # Start address
-        request += struct.pack('>H', register_count)    # Number of registers
-        
+        request = self._request_buf
+        _REQUEST_HEAD.pack_into(request, 0, self.address, function_code, start_address, register_count)
+
         # CRC16 Calculation
-        crc_value = self.crc16(request)
-        request += struct.pack('<H', crc_value)
-        leakage_logger.debug(
-            "Built MODBUS request (func=0x%02X, addr=0x%04X, count=%d): %s",
-            function_code, start_address, register_count, request.hex()
-        )
+        _U16_LE.pack_into(request, _REQUEST_HEAD.size, self.crc16(memoryview(request)[:_REQUEST_HEAD.size]))
+        if leakage_logger.isEnabledFor(logging.DEBUG):  # Skip the hex() formatting when debug is off
+            leakage_logger.debug(
+                "Built MODBUS request (func=0x%02X, addr=0x%04X, count=%d): %s",
+                function_code, start_address, register_count, request.hex()
+            )
         return request
 
-    def send_request(self, function_code, start_address, register_count):
+    def send_async(self, function_code, start_address, register_count):
         """
-        Send a MODBUS RTU request and read the response.
-        For example, function_code=0x04 for reading input registers.
+        Write a MODBUS RTU request without waiting for the reply.
+        Returns a token (the expected reply length) to hand to recv() once the sensor has had time to answer.
+        The bus mutex is not held in between: on a shared bus the caller keeps one request in flight at a time.
         """
-        if not self.ser or not self.ser.is_open:
+        # Calculate expected response length
+        # For function 0x04 (Read Input Registers): 
+        #   header(3 bytes) + data(2*register_count) + CRC(2 bytes)
+        expected_length = 3 + (2 * register_count) + 2
+        request = self.build_modbus_request(function_code, start_address, register_count)
+        return self.write_frame(request, expected_length)
+
+    def write_frame(self, request, expected_length):
+        """Write an already built request frame; returns the recv() token for a reply of expected_length bytes."""
+        if not self.bus.is_open:
             leakage_logger.debug("Serial not open. Attempting to open connection.")
             self.open_connection()
 
-        # Build and send request
-        request = self.build_modbus_request(function_code, start_address, register_count)
         try:
+            self.ser.reset_input_buffer()  # Drop leftovers of an earlier timed-out reply so frames stay aligned
             self.ser.write(request)
-            leakage_logger.debug("Sent request: %s", request.hex())
+            if leakage_logger.isEnabledFor(logging.DEBUG):
+                leakage_logger.debug("Sent request: %s", request.hex())
         except Exception as e:
             leakage_logger.error("Error writing request to serial: %s", str(e))
             raise
 
-        # Small delay for sensor to process the command
-        time.sleep(0.05)  # 50 ms delay
+        return expected_length
 
-        # Calculate expected response length
-        # For function 0x04 (Read Input Registers): 
-        #   header(3 bytes) + data(2*register_count) + CRC(2 bytes)
-        expected_length = 3 + (2 * register_count) + 2
+    def recv(self, token, block=True):
+        """
+        Read the reply to the request that send_async() returned `token` for.
+        With block=False only the bytes already received are taken, so an incomplete reply comes back short.
+        """
         try:
-            response = self.ser.read(expected_length)
-            leakage_logger.debug("Received response: %s", response.hex())
+            if block:
+                response = self._read_until_complete(token)
+            else:
+                response = self.ser.read(min(self.ser.in_waiting, token))
+            if leakage_logger.isEnabledFor(logging.DEBUG):
+                leakage_logger.debug("Received response: %s", response.hex())
         except Exception as e:
             leakage_logger.error("Error reading response from serial: %s", str(e))
             raise
 
         return response
 
+    def _read_until_complete(self, expected_length):
+        """
+        Collect expected_length bytes as they arrive, returning early once the reply is complete.
+        Gives up after REPLY_TIMEOUT and returns what was received, so a partial frame does not
+        hold the caller for the whole port timeout.
+        """
+        deadline = time.monotonic() + REPLY_TIMEOUT
+        response = bytearray()
+        while len(response) < expected_length:
+            waiting = self.ser.in_waiting
+            if waiting:
+                response += self.ser.read(min(expected_length - len(response), waiting))
+            elif time.monotonic() < deadline:
+                time.sleep(REPLY_POLL_INTERVAL)
+            else:
+                break
+        return bytes(response)
+
+    def send_request(self, function_code, start_address, register_count):
+        """
+        Send a MODBUS RTU request and read the response.
+        For example, function_code=0x04 for reading input registers.
+        """
+        with QMutexLocker(self.bus.mutex):  # One transaction on the wire at a time
+            return self.recv(self.send_async(function_code, start_address, register_count))
+
+    def send_raw(self, frame, expected_length):
+        """Send a prebuilt request frame and read a reply of expected_length bytes."""
+        with QMutexLocker(self.bus.mutex):
+            return self.recv(self.write_frame(frame, expected_length))
+
     def parse_response(self, response):
         """Parse the MODBUS RTU response and validate the CRC."""
         if len(response) < 5:
@@ -127,8 +268,9 @@ class LeakageSensor:
             return None
 
         # Extract last two bytes for CRC
-        received_crc = struct.unpack('<H', response[-2:])[0]
-        calculated_crc = self.crc16(response[:-2])
+        received_crc = _U16_LE.unpack_from(response, len(response) - 2)[0]
+        frame = memoryview(response)  # Slices of a view share the response instead of copying it
+        calculated_crc = self.crc16(frame[:-2])
         if received_crc != calculated_crc:
             msg = f"CRC mismatch (received=0x{received_crc:04X}, calculated=0x{calculated_crc:04X})"
             leakage_logger.error(msg)
@@ -141,54 +283,216 @@ class LeakageSensor:
             return None
 
         # Extract data (skip slave address=1 byte, function code=1 byte, byte_count=1 byte)
-        values = []
-        for i in range(0, byte_count, 2):
-            value = struct.unpack('>H', response[3 + i:5 + i])[0]
-            values.append(value)
+        # Registers are big-endian: copy them in one go and swap on little-endian hosts
+        values = array('H')
+        values.frombytes(frame[3:3 + (byte_count & ~1)])
+        if sys.byteorder == 'little':
+            values.byteswap()
 
         leakage_logger.debug("Parsed values: %s", values)
         return values
 
+    def read_registers(self, start_address, register_count, function_code=0x04):
+        """
+        Read register_count contiguous registers in a single MODBUS transaction.
+        Returns the register values as an array('H'), or None for a short response; raises on CRC or serial errors.
+        Poll neighbouring registers through one call rather than one transaction per register.
+        """
+        response = self.send_request(function_code, start_address, register_count)
+        return self.parse_response(response)
+
     def read_leakage_status(self):
         """
         Read the leakage sensor status (function code 0x04).
         This sensor's leakage status might be stored in a single input register at address 0x0000.
         """
         try:
-            response = self.send_request(function_code=0x04, start_address=0x0000, register_count=1)
+            values = self.parse_response(self.send_raw(self._leak_frame, 7))
+        except Exception as e:
+            leakage_logger.error("Error reading leakage status: %s", str(e))
+            return None
+        return self._leakage_status(values)
+
+    def request_leakage_status(self):
+        """Start a leakage status read; returns the token for recv_leakage_status()."""
+        return self.write_frame(self._leak_frame, 7)
+
+    def recv_leakage_status(self, token, block=True):
+        """Finish a read started by request_leakage_status(); returns the status or None like read_leakage_status()."""
+        try:
+            response = self.recv(token, block)
+        except Exception as e:
+            leakage_logger.error("Error reading leakage status: %s", str(e))
+            return None
+        return self.parse_leakage_status(response)
+
+    def parse_leakage_status(self, response):
+        """Turn a complete leakage status reply into the status, or None like read_leakage_status()."""
+        try:
             values = self.parse_response(response)
-            if values:
-                leakage_logger.info("Leakage status read successfully: %d", values[0])
-                return values[0]
-            else:
-                leakage_logger.warning("No data received for leakage status.")
-                return None
         except Exception as e:
             leakage_logger.error("Error reading leakage status: %s", str(e))
             return None
+        return self._leakage_status(values)
+
+    def _leakage_status(self, values):
+        if values:
+            leakage_logger.info("Leakage status read successfully: %d", values[0])
+            return values[0]
+        else:
+            leakage_logger.warning("No data received for leakage status.")
+            return None
 
-class LeakageSensorThread(QThread):
+class LeakageSensorWorker(QObject):
     # Signal to send leak detection status to the main GUI
     leak_status_signal = Signal(bool)  # True for leak detected, False for no leak
 
-    def __init__(self, leakage_sensor, parent=None):
+    POLL_INTERVAL_MS = 250  # Request period
+    REPLY_DELAY_MS = 60  # Time the sensor gets to answer before the reply is first checked
+    REPLY_RECHECK_MS = 20  # Period of further checks while a reply is still incomplete
+    REPLY_DEADLINE = 1.0  # Seconds after the request before a missing reply counts as no answer
+
+    def __init__(self, leakage_sensors, parent=None):
+        """
+        leakage_sensors is one LeakageSensor or a list of them, all polled together.
+        Sensors on different buses are queried at once; sensors sharing a bus take turns.
+        """
         super().__init__(parent)
-        self.leakage_sensor = leakage_sensor
+        if isinstance(leakage_sensors, LeakageSensor):
+            leakage_sensors = [leakage_sensors]
+        self.leakage_sensors = list(leakage_sensors)
         self.running = True
+        self.poll_timer = None
+        # (sensor, token, sensors left on its bus, bytes received so far, deadline) of the requests awaiting replies
+        self.pending = []
+        self.statuses = []  # Statuses collected during the current poll
+
+    def start_monitoring(self):
+        """
+        Poll the sensors from the thread this worker lives in, without a thread of their own.
+        Each tick only writes the requests; the replies are gathered from REPLY_DELAY_MS on with
+        non-blocking reads, rechecked until complete or REPLY_DEADLINE has passed, so the event
+        loop never waits on a serial port and every bus answers in the same window.
+        """
+        self.poll_timer = QTimer(self)
+        self.poll_timer.setInterval(self.POLL_INTERVAL_MS)
+        self.poll_timer.timeout.connect(self.poll_leak)
+        self.poll_timer.start()
+
+    def poll_leak(self):
+        """Write the first status request on every bus, called periodically by QTimer."""
+        if not self.running:
+            self.poll_timer.stop()
+            return
+        if self.pending:  # The previous replies are still arriving; a new request would discard them
+            return
+        queues = {}
+        for sensor in self.leakage_sensors:
+            queues.setdefault(id(sensor.bus), []).append(sensor)
+        self.statuses = []
+        for queue in queues.values():
+            self._request_next(queue)
+        if self.pending:
+            QTimer.singleShot(self.REPLY_DELAY_MS, self.read_leak)
+        elif self.statuses:  # Every request failed to write
+            self._report()
 
-    def run(self):
-        """Thread to continuously monitor the leakage sensor status."""
-        while self.running:
+    def _request_next(self, queue):
+        """Write the request of the next sensor in a bus queue that accepts it."""
+        while queue:
+            sensor = queue.pop(0)
+            if self._try_request((sensor, None, queue, None, time.monotonic() + self.REPLY_DEADLINE)):
+                return
+
+    def _try_request(self, entry):
+        """
+        Write the request of a pending entry once its bus is free. bus.mutex is held from the write
+        until the reply is settled in read_leak, so another thread's transaction on a shared bus
+        can neither interleave with it nor reset away its reply.
+        Returns False when the sensor is done without a reply, True when it is sent or still waiting.
+        """
+        sensor, _, queue, _, deadline = entry
+        if not sensor.bus.mutex.tryLock():
+            if time.monotonic() < deadline:
+                self.pending.append(entry)  # Another thread's transaction is on the bus; retried by read_leak
+                return True
+            leakage_logger.warning("Bus of leakage sensor on %s stayed busy for %.1f s; sensor not polled",
+                                   sensor.port, self.REPLY_DEADLINE)
+            self.statuses.append(None)
+            return False
+        try:
+            token = sensor.request_leakage_status()
+        except Exception:
+            sensor.bus.mutex.unlock()
+            leakage_logger.exception("Error reading leakage sensor on %s", sensor.port)
+            self.statuses.append(None)  # Not polled is not the same as no leak
+            return False
+        self.pending.append((sensor, token, queue, bytearray(), time.monotonic() + self.REPLY_DEADLINE))
+        return True
+
+    def read_leak(self):
+        """
+        Gather the bytes of the outstanding replies. An incomplete reply stays pending until its
+        deadline; once every bus is done the leak state is emitted.
+        """
+        pending, self.pending = self.pending, []
+        if not self.running:
+            self._release(pending)
+            return
+        if not pending:
+            return
+        now = time.monotonic()
+        for entry in pending:
+            sensor, token, queue, received, deadline = entry
+            if token is None:  # Still waiting for the bus
+                if not self._try_request(entry):
+                    self._request_next(queue)
+                continue
             try:
-                status = self.leakage_sensor.read_leakage_status()
-                # 0 means no leak, 1 means leak detected
-                leak_detected = (status == 1)
-                self.leak_status_signal.emit(leak_detected)
-            except Exception as e:
-                print(f"Error reading leakage sensor: {e}")
-            self.msleep(250)  # Polling every second
+                received += sensor.recv(token - len(received), block=False)
+            except Exception:
+                leakage_logger.exception("Error reading leakage sensor on %s", sensor.port)
+                status = None
+            else:
+                if len(received) < token:
+                    if now < deadline:
+                        self.pending.append(entry)  # Still arriving; check again shortly
+                        continue
+                    leakage_logger.warning("No complete leakage status reply from %s within %.1f s (got %d of %d bytes)",
+                                           sensor.port, self.REPLY_DEADLINE, len(received), token)
+                    status = None
+                else:
+                    status = sensor.parse_leakage_status(bytes(received))
+            sensor.bus.mutex.unlock()
+            self.statuses.append(status)
+            self._request_next(queue)  # The bus is free again for its next sensor
+        if self.pending:
+            QTimer.singleShot(self.REPLY_RECHECK_MS, self.read_leak)
+            return
+        self._report()
+
+    def _report(self):
+        """Emit the leak state gathered in self.statuses during this poll."""
+        # 0 means no leak, 1 means leak detected; any sensor reporting a leak counts
+        if any(status == 1 for status in self.statuses):
+            self.leak_status_signal.emit(True)
+        elif any(status is None for status in self.statuses):
+            # A sensor that did not answer is not evidence of no leak; keep the last reported state
+            leakage_logger.warning("Leakage state unknown this poll: %s", self.statuses)
+        else:
+            self.leak_status_signal.emit(False)
+
+    @staticmethod
+    def _release(pending):
+        """Release the bus of every pending entry whose request was written."""
+        for sensor, token, *_ in pending:
+            if token is not None:
+                sensor.bus.mutex.unlock()
 
     def stop(self):
-        """Stop the thread."""
+        """Stop polling; replies still in flight are discarded and their buses released."""
         self.running = False
-        self.wait()
\ No newline at end of file
+        if self.poll_timer is not None:
+            self.poll_timer.stop()
+        pending, self.pending = self.pending, []
+        self._release(pending)
@@ -9,18 +9,63 @@ from PySide6.QtWidgets import (QApplication, QWidget, QVBoxLayout, QPushButton,
 from PySide6.QtCore import Qt, QTimer, QThread
 from servo_control import ServoControl, ServoWorker
 from voltage_collector import VoltageCollector, VoltageCollectorWorker
-from leakage_sensor import LeakageSensor, LeakageSensorThread
+from leakage_sensor import LeakageSensor, LeakageSensorWorker
 from pressure_sensor import PressureSensor, PressureSensorThread
 from relay_control import RelayControl, RelayControlWorker
 from gearpump_control import GearPumpController, GearpumpControlWorker
 from power_supply import PowerSupplyControl, PowerSupplyWorker
 from scservo_sdk import *  # Import SCServo SDK library
-from data_update import DataUpdateWorker
+from data_update import DataUpdateWorker, aligned_zeros
 import datetime
+from contextlib import contextmanager
 from inter_oper import InterOpWorker
 from intermittent_dialog import IntermittentOperationDialog
 from error_processing import ErrorProcessing
 
+# Label texts, formatted through prebound methods instead of an f-string per sample
+PRESSURE_TEXT = "Inlet pressure of reactor: {:.3f} MPa".format
+SERVO_TEXT = "Servo {} - Position: {}, Speed: {}, Load: {}, T: {} ℃".format
+PUMP_PRESSURE_TEXT = "P: {:.2f} Bar".format
+PUMP_FLOW_TEXT = "FR: {} mL/min".format
+PUMP_ROTATE_TEXT = "RR: {} RPM".format
+PUMP_TEMPERATURE_TEXT = "T: {:.2f} °C".format
+PUMP_STATE_TEXT = "Pump State: {}".format
+PS_STATE_TEXT = "Power Supply State: {}".format
+PS_CURRENT_TEXT = "Measured Current: {} A".format
+PS_VOLTAGE_TEXT = "Measured Voltage: {} V".format
+PS_POWER_TEXT = "Measured Power: {} W".format
+
+def _voltage_table(cell):
+    """Rich-text template laying out the first 10 voltage readings in 2 rows of 5, one cell per channel."""
+    rows = ("".join(f"<td>Voltage {i + 1}: {cell} V</td>" for i in range(row, row + 5)) for row in (0, 5))
+    return "<table cellspacing='4'>" + "".join(f"<tr>{row}</tr>" for row in rows) + "</table>"
+
+# All 10 voltages go into one label, so a reading costs one layout pass rather than ten
+VOLTAGE_TEXT = _voltage_table("{:.2f}").format
+VOLTAGE_PLACEHOLDER = _voltage_table("---")
+
+# History curves hold only finite samples and are redrawn every second: skip pyqtgraph's
+# per-setData NaN scan and antialiased rasterization
+CURVE_OPTS = dict(skipFiniteCheck=True, antialias=False)
+
+# Set once per relay indicator; a state flip only changes the "state" property and repolishes
+RELAY_INDICATOR_QSS = (
+    "QFrame { background-color: grey; border-radius: 10px; }"
+    "QFrame[state='on'] { background-color: green; }"
+    "QFrame[state='off'] { background-color: red; }"
+)
+
+@contextmanager
+def _silent(*widgets):
+    """Block the widgets' signals so programmatic updates don't echo back as servo commands."""
+    for w in widgets:
+        w.blockSignals(True)
+    try:
+        yield
+    finally:
+        for w in widgets:
+            w.blockSignals(False)
+
 class MainGUI(QWidget):
     def __init__(self):
         super().__init__()
@@ -52,11 +97,20 @@ class MainGUI(QWidget):
         self.servo_thread.started.connect(self.servo_control_worker.start)
         self.servo_thread.finished.connect(self.servo_thread.deleteLater)
         self.servo_control_worker.servo_stopped.connect(self.servo_control_worker.stop)
-        self.servo_control_worker.position_updated.connect(self.update_servo_info)
         self.servo_control_worker.button_checked_close.connect(self.servo_control_worker.write_position_checked_close)
         self.servo_control_worker.button_checked_open.connect(self.servo_control_worker.write_position_checked_open)
         self.servo_control_worker.button_checked_distorque_close.connect(self.servo_control_worker.disable_torque_checked_close)
         self.servo_control_worker.button_checked_distorque_open.connect(self.servo_control_worker.disable_torque_checked_open)
+        self.servo_control_worker.button_checked_close_batch.connect(self.servo_control_worker.write_position_checked_close_batch)
+        self.servo_control_worker.button_checked_open_batch.connect(self.servo_control_worker.write_position_checked_open_batch)
+        self.servo_control_worker.button_checked_distorque_close_batch.connect(self.servo_control_worker.disable_torque_checked_close_batch)
+        self.servo_control_worker.button_checked_distorque_open_batch.connect(self.servo_control_worker.disable_torque_checked_open_batch)
+
+        # Pull polled servo states at 10 Hz instead of taking one queued signal per servo per poll
+        self.servo_refresh_timer = QTimer(self)
+        self.servo_refresh_timer.setInterval(100)
+        self.servo_refresh_timer.timeout.connect(self.refresh_servo_info)
+        self.servo_refresh_timer.start()
 
         # Initialize the voltage collector
         self.voltage_collector = VoltageCollector('COM7')
@@ -68,11 +122,11 @@ class MainGUI(QWidget):
         self.voltage_collector_worker.voltages_updated.connect(self.update_voltages)
         self.voltage_collector_worker.stopped.connect(self.voltage_collector_worker.stop_collecting)
 
-        # Initialize the leakage sensor and thread
+        # Initialize the leakage sensor, polled by a timer in the GUI event loop
         self.leakage_sensor = LeakageSensor('COM5')
-        self.leakage_sensor_thread = LeakageSensorThread(self.leakage_sensor)
-        self.leakage_sensor_thread.leak_status_signal.connect(self.update_leak_status)
-        self.leakage_sensor_thread.start()
+        self.leakage_sensor_worker = LeakageSensorWorker(self.leakage_sensor, self)
+        self.leakage_sensor_worker.leak_status_signal.connect(self.update_leak_status)
+        self.leakage_sensor_worker.start_monitoring()
 
         # Initialize the pressure sensor and thread
         self.pressure_sensor = PressureSensor('COM4', baudrate=9600, address=1)
@@ -133,47 +187,53 @@ class MainGUI(QWidget):
         self.io_worker = None  # Initialize without starting the worker yet
         self.io_worker_thread = None  # Initialize without starting the thread yet
         self.io_interval = 30  # Default interval minutes for intermittent operation
+        self.label_texts = {}  # Last text set on each live-reading label
+        self.latest_plot_data = None  # Newest plot payload not yet drawn
+        self.plot_paint_pending = False  # A paint is scheduled; further payloads only replace latest_plot_data
 
         # Initialize data history and time history
-        self.time_history = np.linspace(-600, 0, 600)  # Time axis, representing the last 10 minutes
-        self.pressure_history = np.zeros(600) 
+        # Histories are float32, one contiguous row per channel and cache-line aligned, matching the
+        # RingBuffer snapshots DataUpdateWorker emits, so update_plots' copyto moves aligned blocks
+        self.time_history = np.linspace(-600, 0, 600, dtype=np.float32)  # Time axis, representing the last 10 minutes
+        self.time_history.setflags(write=False)  # One shared x array for every curve; never modified
+        self.pressure_history = aligned_zeros(600)
         self.voltage_channels = 10  # Number of voltage channels
-        self.voltage_data = np.zeros((self.voltage_channels, 600))  # Voltage data history
-        self.flow_data = np.zeros(600)  # Flow rate data history
-        self.ps_current = np.zeros(600)  # Power supply current history
-        self.ps_voltage = np.zeros(600)  # Power supply voltage history
+        self.voltage_data = aligned_zeros((self.voltage_channels, 600))  # Voltage data history
+        self.flow_data = aligned_zeros(600)  # Flow rate data history
+        self.ps_current = aligned_zeros(600)  # Power supply current history
+        self.ps_voltage = aligned_zeros(600)  # Power supply voltage history
+
+        # One thread shared by the timer-driven workers that do no serial I/O (data updating, error checking);
+        # the device workers keep their own threads since their reads block
+        self.monitor_thread = QThread()
+        self.monitor_thread.finished.connect(self.monitor_thread.deleteLater)
 
-        # Initialize the date updating thread
-        self.data_updater_thread = QThread()
+        # Initialize the date updating worker
         self.data_updater_worker = DataUpdateWorker(pressure_history_size=600, voltage_channels=self.voltage_channels)
-        self.data_updater_worker.moveToThread(self.data_updater_thread)
+        self.data_updater_worker.moveToThread(self.monitor_thread)
         self.data_updater_worker.stopped.connect(self.data_updater_worker.stop)
-        self.data_updater_thread.started.connect(self.data_updater_worker.start)
-        self.data_updater_thread.finished.connect(self.data_updater_thread.deleteLater)
+        self.monitor_thread.started.connect(self.data_updater_worker.start)
         self.pressure_sensor_thread.pressure_updated.connect(self.data_updater_worker.update_pressure)
         self.gearpump_worker.temperature_updated.connect(self.data_updater_worker.update_pump_PT)
-        self.voltage_collector_worker.voltages_updated.connect(self.data_updater_worker.update_voltages)
+        self.voltage_collector_worker.voltages_batch_updated.connect(self.data_updater_worker.update_voltages_batch)
         self.gearpump_worker.flow_rate_updated.connect(self.data_updater_worker.update_flow_rate)
         self.power_supply_worker.current_measured.connect(self.data_updater_worker.update_ps_current)
         self.power_supply_worker.voltage_measured.connect(self.data_updater_worker.update_ps_voltage)
-        self.data_updater_worker.plot_update_signal.connect(self.update_plots)
+        self.data_updater_worker.plot_update_signal.connect(self.queue_plot_update)
         self.data_updater_worker.start_storing_signal.connect(self.data_updater_worker.start_storing_data)
         self.data_updater_worker.stop_storing_signal.connect(self.data_updater_worker.stop_storing_data)
 
-        # Initialize the error processing worker and move it to a new thread
+        # Initialize the error processing worker on the shared monitor thread
         self.error_processing_worker = ErrorProcessing()
-        self.error_processing_thread = QThread()
-        self.error_processing_worker.moveToThread(self.error_processing_thread)
-        self.error_processing_thread.started.connect(self.error_processing_worker.start_checking)
-        self.error_processing_thread.finished.connect(self.error_processing_thread.deleteLater)
+        self.error_processing_worker.moveToThread(self.monitor_thread)
+        self.monitor_thread.started.connect(self.error_processing_worker.start_checking)
         self.error_processing_worker.turn_off_ps.connect(self.power_supply_worker.turn_off_checked)
         self.error_processing_worker.turn_off_gp.connect(self.gearpump_worker.turnoff_pump_checked)
         self.gearpump_worker.pressure_updated.connect(self.error_processing_worker.get_gp_pressure)
         self.voltage_collector_worker.voltages_updated.connect(self.error_processing_worker.get_reacotr_voltages)
-        self.leakage_sensor_thread.leak_status_signal.connect(self.error_processing_worker.get_leakage_state)
+        self.leakage_sensor_worker.leak_status_signal.connect(self.error_processing_worker.get_leakage_state)
         self.error_processing_worker.stopped.connect(self.error_processing_worker.stop)
 
-        self.data_updater_thread.start()
         self.pressure_sensor_thread.start()
         
         # Initialize the UI
@@ -184,7 +244,7 @@ class MainGUI(QWidget):
         self.gearpump_thread.start()
         self.servo_thread.start()
         self.power_supply_thread.start()
-        self.error_processing_thread.start()
+        self.monitor_thread.start()
 
     def init_ui(self):
         self.setWindowTitle('Control with Voltage, Leak, Pressure, and Relay Management')
@@ -261,7 +321,7 @@ class MainGUI(QWidget):
         self.pump_flow_plot_widget.setLabel('left', 'Flow Rate (mL/min)')
         self.pump_flow_plot_widget.setLabel('bottom', 'Time (s)')
         self.pump_flow_plot_widget.setYRange(0, 6000)  # Adjust the y-axis range as needed
-        self.pump_flow_curve = self.pump_flow_plot_widget.plot(self.time_history, self.flow_data, pen='b')
+        self.pump_flow_curve = self.pump_flow_plot_widget.plot(self.time_history, self.flow_data, pen='b', **CURVE_OPTS)
 
         gearpump_control_panel.addWidget(self.pump_flow_plot_widget)
 
@@ -277,7 +337,7 @@ class MainGUI(QWidget):
         self.pressure_plot_widget.setLabel('left', 'Pressure (MPa)')
         self.pressure_plot_widget.setLabel('bottom', 'Time (s)')
         self.pressure_plot_widget.setYRange(0, 1)  # Set y-axis from 0 to 1 MPa
-        self.pressure_curve = self.pressure_plot_widget.plot(self.time_history, self.pressure_history, pen='y')
+        self.pressure_curve = self.pressure_plot_widget.plot(self.time_history, self.pressure_history, pen='y', **CURVE_OPTS)
 
         gearpump_layout.addWidget(self.pressure_plot_widget)
         main_layout.addLayout(gearpump_layout)
@@ -367,15 +427,19 @@ class MainGUI(QWidget):
         self.current_viewbox.setYRange(0, 10)  # Set range for current from 0 to 0.5 A
 
         # Create curves for voltage and current
-        self.ps_voltage_curve = self.ps_plot_widget.plot(self.time_history, self.ps_voltage, pen='b', name='Voltage')
+        self.ps_voltage_curve = self.ps_plot_widget.plot(self.time_history, self.ps_voltage, pen='b', name='Voltage', **CURVE_OPTS)
 
         # Create the current curve in the second ViewBox
-        self.ps_current_curve = pg.PlotCurveItem(self.time_history, self.ps_current, pen=pg.mkPen(color='r'), name='Current')
+        self.ps_current_curve = pg.PlotDataItem(self.time_history, self.ps_current, pen=pg.mkPen(color='r'), name='Current', **CURVE_OPTS)
         self.current_viewbox.addItem(self.ps_current_curve)  # Add current curve to the ViewBox
         self.ps_current_curve.setZValue(1)  # Ensure current curve is on top
 
-        # Sync the x-axis of the voltage and current plots
-        self.ps_plot_widget.getViewBox().sigResized.connect(self.update_views)
+        # Sync the x-axis of the voltage and current plots, once a burst of resize events has settled
+        self.view_sync_timer = QTimer(self)
+        self.view_sync_timer.setSingleShot(True)
+        self.view_sync_timer.setInterval(50)
+        self.view_sync_timer.timeout.connect(self.update_views)
+        self.ps_plot_widget.getViewBox().sigResized.connect(self.schedule_view_sync)
 
         # Add legend to the plot
         self.ps_plot_widget.addLegend()
@@ -384,6 +448,10 @@ class MainGUI(QWidget):
         display_layout.addWidget(self.ps_plot_widget)
 
         # Voltage channel checkboxes to toggle channels
+        self.voltage_replot_timer = QTimer(self)
+        self.voltage_replot_timer.setSingleShot(True)
+        self.voltage_replot_timer.setInterval(30)
+        self.voltage_replot_timer.timeout.connect(self.refresh_voltage_curves)
         self.voltage_checkboxes = []
         voltage_checkbox_layout = QGridLayout()
         for i in range(self.voltage_channels):
@@ -395,11 +463,9 @@ class MainGUI(QWidget):
         display_layout.addLayout(voltage_checkbox_layout)
 
         # Grid layout to display the first 10 voltages - placed before the voltage curve
-        self.voltage_labels = [QLabel(f"Voltage {i+1}: --- V") for i in range(10)]
-        voltage_label_layout = QGridLayout()
-        for i, label in enumerate(self.voltage_labels):
-            voltage_label_layout.addWidget(label, i // 5, i % 5)
-        display_layout.addLayout(voltage_label_layout)
+        self.voltage_label = QLabel(VOLTAGE_PLACEHOLDER, self)
+        self.voltage_label.setTextFormat(Qt.RichText)
+        display_layout.addWidget(self.voltage_label)
 
         # Voltage plot setup (new) with legend
         self.voltage_plot_widget = pg.PlotWidget(title="Voltage Channels Over Time")
@@ -409,11 +475,19 @@ class MainGUI(QWidget):
         # Add the legend to the voltage plot
         self.voltage_plot_widget.addLegend(offset=(10, 10))
 
+        # One pen per channel, built once (same colours as pen=(i, voltage_channels)); cosmetic keeps width in pixels
+        self.voltage_pens = [pg.mkPen(color=pg.intColor(i, self.voltage_channels), width=1, cosmetic=True)
+                             for i in range(self.voltage_channels)]
         self.voltage_curves = []
         for i in range(self.voltage_channels):  # Assuming voltage_channels = 10
-            curve = self.voltage_plot_widget.plot(self.time_history, self.voltage_data[i], pen=(i, self.voltage_channels), name=f"Channel {i+1}")
+            curve = self.voltage_plot_widget.plot(self.time_history, self.voltage_data[i], pen=self.voltage_pens[i], name=f"Channel {i+1}", **CURVE_OPTS)
             self.voltage_curves.append(curve)
 
+        # Let pyqtgraph reduce every history curve to about one min/max pair per pixel before drawing
+        for curve in [self.pump_flow_curve, self.pressure_curve, self.ps_voltage_curve, self.ps_current_curve] + self.voltage_curves:
+            curve.setDownsampling(auto=True, method='peak')
+            curve.setClipToView(True)
+
         # Add voltage plot under the checkboxes and labels
         display_layout.addWidget(self.voltage_plot_widget)
 
@@ -425,6 +499,8 @@ class MainGUI(QWidget):
 
         # Servo controls layout
         servo_layout = QGridLayout()
+        self.servo_widgets = {}  # servo_id -> (info_label, position_slider, switch_button)
+        self.servo_button_states = {}  # servo_id -> text the switch button shows ('Open', 'Close' or 'Adjusting')
         for scs_id in self.servos.keys():
             servo_control_widget = self.create_servo_control_widget(scs_id)
             servo_layout.addWidget(servo_control_widget, (scs_id - 1) // 2, (scs_id - 1) % 2)
@@ -436,6 +512,7 @@ class MainGUI(QWidget):
         self.leak_indicator = QFrame(self)
         self.leak_indicator.setFixedSize(20, 20)
         self.leak_indicator.setStyleSheet("background-color: gray; border-radius: 10px;")
+        self.leak_shown = None  # Leak state the label and indicator currently show
         leak_layout.addWidget(self.leak_label)
         leak_layout.addWidget(self.leak_indicator)
         control_layout.addLayout(leak_layout)
@@ -455,11 +532,12 @@ class MainGUI(QWidget):
         # Clearer relay status display using indicator frames
         self.relay_status_labels = [QLabel(f"Channel {i+1}: ---") for i in range(16)]
         self.relay_status_indicators = [QFrame(self) for _ in range(16)]
+        self.relay_shown = [None] * 16  # Relay state each label and indicator currently shows
 
         relay_status_layout = QGridLayout()
         for i, (label, indicator) in enumerate(zip(self.relay_status_labels, self.relay_status_indicators)):
             indicator.setFixedSize(20, 20)
-            indicator.setStyleSheet("background-color: grey; border-radius: 10px;")
+            indicator.setStyleSheet(RELAY_INDICATOR_QSS)
             relay_status_layout.addWidget(label, i // 4, (i % 4) * 2)
             relay_status_layout.addWidget(indicator, i // 4, (i % 4) * 2 + 1)
         control_layout.addLayout(relay_status_layout)
@@ -524,12 +602,16 @@ class MainGUI(QWidget):
         """Show the intermittent operation dialog."""
         self.inter_op_dialog.show()
     
-    def update_dialog_plots(self, available_power, reactor_states):
+    def update_dialog_plots(self, available_power, reactor_mask):
         """Receive real-time updates from InterOpWorker and pass them to the dialog for plotting."""
-        running_reactors = len(reactor_states)  # Count reactors currently running (assuming True indicates active)
-        time_step = len(self.inter_op_dialog.time_data)  # Use length of time data for time axis
+        running_reactors = bin(reactor_mask).count('1')  # Count reactors currently running (bit i = reactor i)
+        time_step = self.inter_op_dialog.num_points  # Use number of plotted points for time axis
         self.inter_op_dialog.update_plots(time_step, available_power, running_reactors)
 
+    def schedule_view_sync(self, *args):
+        """Restart the view sync timer; dragging the window resizes many times, update_views runs once after."""
+        self.view_sync_timer.start()
+
     def update_views(self):
         """Sync the second y-axis with the main plot when resizing occurs."""
         self.current_viewbox.setGeometry(self.ps_plot_widget.getViewBox().sceneBoundingRect())
@@ -551,6 +633,7 @@ class MainGUI(QWidget):
         position_slider.setMaximum(3071)
         position_slider.setValue(2047)
         position_slider.setObjectName(f"servo_slider_{scs_id}")
+        position_slider.setTracking(False)  # Emit one write on release instead of one per drag step
         position_slider.valueChanged.connect(lambda value, sid=scs_id: self.slider_moved(sid, value))
         layout.addWidget(position_slider)
 
@@ -562,6 +645,7 @@ class MainGUI(QWidget):
         switch_button.clicked.connect(lambda checked, sid=scs_id: self.toggle_servo_position(sid, checked))
         layout.addWidget(switch_button)
 
+        self.servo_widgets[scs_id] = (info_label, position_slider, switch_button)
         widget.setLayout(layout)
         return widget
 
@@ -576,6 +660,10 @@ class MainGUI(QWidget):
         self.relay_control_worker.button_clicked.emit(channels, states)
 
     def update_leak_status(self, leak_detected):
+        # Polled at 4 Hz; restyling the indicator is only needed when the state changes
+        if leak_detected == self.leak_shown:
+            return
+        self.leak_shown = leak_detected
         if leak_detected:
             self.leak_label.setText("Leak Status: Leak Detected")
             self.leak_indicator.setStyleSheet("background-color: red; border-radius: 10px;")
@@ -584,30 +672,27 @@ class MainGUI(QWidget):
             self.leak_indicator.setStyleSheet("background-color: green; border-radius: 10px;")
 
     def update_pressure(self, pressure, cur_time):
-        self.pressure_label.setText(f"Inlet pressure of reactor: {pressure:.3f} MPa")
+        self.set_label_text(self.pressure_label, PRESSURE_TEXT(pressure))
 
     def update_plots(self, data):
         """Update both the pressure and voltage plots."""
-        pressure_history = data['pressure']
-        voltage_data = data['voltages']
-        flow_history = data['flow_rate']
-        ps_current = data['ps_current']
-        ps_voltage = data['ps_voltage']
-        self.ps_current = ps_current
-        self.ps_voltage = ps_voltage
-        self.pressure_history = pressure_history
-        self.voltage_data = voltage_data
+        # Copy into the histories allocated in __init__ so the arrays the curves hold stay the same objects
+        np.copyto(self.pressure_history, data['pressure'])
+        np.copyto(self.voltage_data, data['voltages'])
+        np.copyto(self.flow_data, data['flow_rate'])
+        np.copyto(self.ps_current, data['ps_current'])
+        np.copyto(self.ps_voltage, data['ps_voltage'])
+        pressure_history = self.pressure_history
+        flow_history = self.flow_data
+        ps_current = self.ps_current
+        ps_voltage = self.ps_voltage
 
         # Update the pressure plot
         
         self.pressure_curve.setData(self.time_history, pressure_history)
 
         # Update the voltage plot with selected channels
-        for i, curve in enumerate(self.voltage_curves):
-            if self.voltage_checkboxes[i].isChecked():
-                curve.setData(self.time_history, voltage_data[i])
-            else:
-                curve.setData([], [])  # Hide the curve if checkbox is unchecked
+        self.refresh_voltage_curves()
 
         # Update the pump flow rate plot
         self.pump_flow_curve.setData(self.time_history, flow_history)
@@ -618,74 +703,106 @@ class MainGUI(QWidget):
         self.ps_voltage_curve.setData(self.time_history, ps_voltage)
         self.ps_current_curve.setData(self.time_history, ps_current)
 
+    def queue_plot_update(self, data):
+        """
+        Keep only the newest plot payload and paint once per event-loop pass,
+        so a backlog of updates is dropped instead of redrawn one by one.
+        """
+        self.latest_plot_data = data
+        if not self.plot_paint_pending:
+            self.plot_paint_pending = True
+            QTimer.singleShot(0, self.paint_latest_plot)
+
+    def paint_latest_plot(self):
+        data, self.latest_plot_data = self.latest_plot_data, None
+        self.plot_paint_pending = False
+        if data is not None:
+            self.update_plots(data)
+
+    def refresh_voltage_curves(self):
+        """Show the checked voltage channels with the current history and hide the rest."""
+        for i, curve in enumerate(self.voltage_curves):
+            checked = self.voltage_checkboxes[i].isChecked()
+            if curve.isVisible() != checked:
+                curve.setVisible(checked)  # Hide the curve if checkbox is unchecked
+            if checked:  # Hidden curves keep their old data until shown again
+                curve.setData(self.time_history, self.voltage_data[i])
+
     def toggle_voltage_curve(self):
-        """Update the voltage plot when channel selection changes."""
-        self.update_plots({'pressure': self.pressure_history, 'voltages': self.voltage_data, 'ps_current': self.ps_current, 'ps_voltage': self.ps_voltage})
+        """Update the voltage plot when channel selection changes; rapid toggles collapse into one refresh."""
+        self.voltage_replot_timer.start()  # Restarts the single-shot countdown if already pending
 
     def update_voltages(self, voltages, cur_time):
-        for i, voltage in enumerate(voltages[:10]):
-            self.voltage_labels[i].setText(f"Voltage {i+1}: {voltage:.2f} V")
+        self.set_label_text(self.voltage_label, VOLTAGE_TEXT(*voltages[:10]))
+
+    def set_label_text(self, label, text):
+        """Set a label's text only when it changed, sparing Qt the relayout for repeated readings."""
+        if self.label_texts.get(label) != text:
+            self.label_texts[label] = text
+            label.setText(text)
 
     def toggle_servo_position(self, servo_id, checked):
         position = 3071 if checked else 2047
+        self.servo_button_states.pop(servo_id, None)  # The click toggled the button; let the next poll set it again
         self.servo_control_worker.write_position_signal.emit(servo_id, position)
 
     def slider_moved(self, servo_id, position):
         self.servo_control_worker.write_position_signal.emit(servo_id, position)
 
+    def refresh_servo_info(self):
+        for servo_id, state in self.servo_control_worker.take_states().items():
+            self.update_servo_info(servo_id, *state)
+
     def update_servo_info(self, servo_id, pos, speed, load, temp):
         # Update the specific servo's info label and slider
-        info_label = self.findChild(QLabel, f"servo_info_{servo_id}")
-        position_slider = self.findChild(QSlider, f"servo_slider_{servo_id}")
-        switch_button = self.findChild(QPushButton, f"servo_button_{servo_id}")
-
-        if info_label and position_slider and switch_button:
-            info_label.setText(f"Servo {servo_id} - Position: {pos}, Speed: {speed}, Load: {load}, T: {temp} ℃")
-            position_slider.blockSignals(True)
-            position_slider.setValue(pos)
-            position_slider.blockSignals(False)
-
-            if pos >= 3040:
-                switch_button.blockSignals(True)
-                switch_button.setChecked(True)
-                switch_button.setText("Close")
-                switch_button.blockSignals(False)
-            elif pos <= 2100:
-                switch_button.blockSignals(True)
-                switch_button.setChecked(False)
-                switch_button.setText("Open")
-                switch_button.blockSignals(False)
-            else:
-                switch_button.blockSignals(True)
-                switch_button.setChecked(True)
-                switch_button.setText("Adjusting")
-                switch_button.blockSignals(False)
+        widgets = self.servo_widgets.get(servo_id)
+
+        if widgets is not None:
+            info_label, position_slider, switch_button = widgets
+            self.set_label_text(info_label, SERVO_TEXT(servo_id, pos, speed, load, temp))
+            # Don't pull the handle out from under a drag
+            if position_slider.value() != pos and not position_slider.isSliderDown():
+                with _silent(position_slider):
+                    position_slider.setValue(pos)
+
+            state = 'Close' if pos >= 3040 else 'Open' if pos <= 2100 else 'Adjusting'
+            if self.servo_button_states.get(servo_id) != state:
+                self.servo_button_states[servo_id] = state
+                with _silent(switch_button):
+                    switch_button.setChecked(state != 'Open')
+                    switch_button.setText(state)
 
     def update_relay_states(self, states):
         """Update the relay states with clear status labels and indicators."""
         for i, state in enumerate(states):
+            state = bool(state)
+            if self.relay_shown[i] == state:
+                continue  # Only repolish an indicator when its relay flips
+            self.relay_shown[i] = state
             self.relay_status_labels[i].setText(f"Channel {i+1}: {'ON' if state else 'OFF'}")
-            color = "green" if state else "red"
-            self.relay_status_indicators[i].setStyleSheet(f"background-color: {color}; border-radius: 10px;")
+            indicator = self.relay_status_indicators[i]
+            indicator.setProperty("state", "on" if state else "off")
+            indicator.style().unpolish(indicator)
+            indicator.style().polish(indicator)
         try:
             self.io_worker.receive_relay_state(states)
         except:
             pass
 
     def update_pump_pressure(self, pressure):
-        self.gearpump_pressure_label.setText(f"P: {pressure:.2f} Bar")
+        self.set_label_text(self.gearpump_pressure_label, PUMP_PRESSURE_TEXT(pressure))
     
     def update_pump_flow_rate(self, flow, cur_time):
-        self.gearpump_flow_rate_label.setText(f"FR: {flow} mL/min")
+        self.set_label_text(self.gearpump_flow_rate_label, PUMP_FLOW_TEXT(flow))
 
     def update_pump_rotate_rate(self, rotate_rate):
-        self.gearpump_rotate_rate_label.setText(f"RR: {rotate_rate} RPM")
+        self.set_label_text(self.gearpump_rotate_rate_label, PUMP_ROTATE_TEXT(rotate_rate))
 
     def update_pump_temperature(self, temperature):
-        self.gearpump_temperature_label.setText(f"T: {temperature:.2f} °C")
+        self.set_label_text(self.gearpump_temperature_label, PUMP_TEMPERATURE_TEXT(temperature))
     
     def update_pump_state(self, state):
-        self.gearpump_state_label.setText(f"Pump State: {state}")
+        self.set_label_text(self.gearpump_state_label, PUMP_STATE_TEXT(state))
     
     def set_gearpump_flow_rate(self):
         flow_rate = self.flow_rate_spinbox.value()
@@ -702,16 +819,16 @@ class MainGUI(QWidget):
         self.gearpump_worker.stop_pump_set.emit(0)
 
     def update_ps_state(self, state):
-        self.power_state_label.setText(f"Power Supply State: {state}")
+        self.set_label_text(self.power_state_label, PS_STATE_TEXT(state))
     
     def update_ps_current(self, current, cur_time):   
-        self.measured_current_label.setText(f"Measured Current: {current} A")
+        self.set_label_text(self.measured_current_label, PS_CURRENT_TEXT(current))
 
     def update_ps_voltage(self, voltage, cur_time):
-        self.measured_voltage_label.setText(f"Measured Voltage: {voltage} V")
+        self.set_label_text(self.measured_voltage_label, PS_VOLTAGE_TEXT(voltage))
 
     def update_ps_power(self, power):
-        self.measured_power_label.setText(f"Measured Power: {power} W")
+        self.set_label_text(self.measured_power_label, PS_POWER_TEXT(power))
 
     def set_power_supply_current(self):
         current = self.set_current_spinbox.value()
@@ -749,7 +866,7 @@ class MainGUI(QWidget):
         # Connect signals and slots
         self.io_worker_thread.started.connect(self.io_worker.run)
         self.io_worker_thread.finished.connect(self.io_worker_thread.deleteLater)
-        self.io_worker.solar_reactor_signal.connect(self.update_dialog_plots)
+        self.io_worker.solar_reactor_signal.connect(self.update_dialog_plots, Qt.QueuedConnection)
         self.io_worker.finished.connect(self.data_updater_worker.stop_storing_data)
         self.io_worker.finished.connect(self.io_worker.deleteLater)
         self.io_worker.first_run_signal.connect(self.data_updater_worker.collect_inital_voltage)
@@ -765,46 +882,48 @@ class MainGUI(QWidget):
     def io_worker_stop(self):
         # Check if the thread is running before attempting to stop it
         if self.io_worker_thread.isRunning():
-            # Stop the worker
+            # Stop the worker, then quit the thread once it has had 2 s to wind down, without blocking the GUI meanwhile
             self.io_worker.stopped_signal.emit()
-            time.sleep(2)
-            # Quit and wait for the thread to finish
-            self.io_worker_thread.quit()
-            self.io_worker_thread.wait()
+            QTimer.singleShot(2000, lambda thread=self.io_worker_thread: self.quit_io_thread(thread))
     
     def io_worker_reset(self):
         # Check if the thread is running before attempting to stop it
         try:
             if self.io_worker_thread.isRunning():
-                # Stop the worker
+                # Stop the worker; the dialog is reset after the thread quits so late plot updates don't refill it
                 self.io_worker.stopped_signal.emit()
-                time.sleep(2)
-                # Quit and wait for the thread to finish
-                self.io_worker_thread.quit()
-                self.io_worker_thread.wait()
+                QTimer.singleShot(2000, lambda thread=self.io_worker_thread: self.quit_io_thread(thread, reset=True))
+                return
         except:
             pass
-        self.inter_op_dialog.time_data = []
-        self.inter_op_dialog.dc_power_data = []
-        self.inter_op_dialog.reactor_data = []    
+        self.inter_op_dialog.reset_data()
+
+    def quit_io_thread(self, thread, reset=False):
+        """Quit and wait for an intermittent-operation thread that was asked to stop, optionally resetting the dialog."""
+        try:
+            thread.quit()
+            thread.wait()
+        except RuntimeError:
+            pass  # Already finished and deleted
+        if reset:
+            self.inter_op_dialog.reset_data()
 
     def closeEvent(self, event):
-        self.error_processing_thread.quit()
-        self.error_processing_thread.wait()
+        self.monitor_thread.quit()
+        self.monitor_thread.wait()
         self.power_supply_thread.quit()
         self.power_supply_thread.wait()
         self.servo_thread.quit()
         self.servo_thread.wait()
         self.voltage_thread.quit()
         self.voltage_thread.wait()
-        self.leakage_sensor_thread.stop()
+        self.leakage_sensor_worker.stop()
         self.pressure_sensor_thread.stop()
         self.relay_control_thread.quit()
         self.relay_control_thread.wait()
         self.gearpump_thread.quit()
         self.gearpump_thread.wait()
-        self.data_updater_thread.quit()
-        self.data_updater_thread.wait()
+        self.data_updater_worker.close_writer()
         self.portHandler.closePort()
         self.gearpump_control.close_serial()
         self.voltage_collector.close_connection()
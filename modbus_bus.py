@@ -0,0 +1,40 @@
+from PySide6.QtCore import QMutex
+import serial
+
+class ModbusBus:
+    """
+    One RS-485 serial port shared by every MODBUS RTU slave wired to it.
+    The port is opened once; per-slave devices take the bus instead of a port name and
+    hold `mutex` for each request/reply transaction so requests never interleave on the wire.
+    """
+
+    def __init__(self, port, baudrate=9600, timeout=0.2, inter_byte_timeout=0.02):
+        self.port = port
+        self.baudrate = baudrate
+        self.timeout = timeout  # Upper bound on a reply; read() returns as soon as the expected bytes arrive
+        self.inter_byte_timeout = inter_byte_timeout  # A gap this long inside a reply means the frame has ended
+        self.ser = None
+        self.mutex = QMutex()  # Serializes transactions from devices polled on different threads
+
+    @property
+    def is_open(self):
+        return self.ser is not None and self.ser.is_open
+
+    def open(self):
+        """Open the port unless another device on the bus already did."""
+        if self.is_open:
+            return
+        self.ser = serial.Serial(
+            port=self.port,
+            baudrate=self.baudrate,
+            parity=serial.PARITY_NONE,
+            stopbits=serial.STOPBITS_ONE,
+            bytesize=serial.EIGHTBITS,
+            timeout=self.timeout,
+            inter_byte_timeout=self.inter_byte_timeout
+        )
+
+    def close(self):
+        """Close the port for every device on the bus."""
+        if self.is_open:
+            self.ser.close()
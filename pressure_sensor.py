@@ -18,6 +18,17 @@ pressuresensor_handler.setFormatter(formatter)
 pressuresensor_logger.addHandler(pressuresensor_handler)
 pressuresensor_logger.setLevel(logging.INFO)
 
+_REQUEST_HEAD = struct.Struct('>BBHH')  # slave address, function code, start address, register count or value
+_REQUEST_ADDR = struct.Struct('>BBH')  # slave address, function code, start address
+_U16_LE = struct.Struct('<H')  # CRC, low byte first
+_REGISTERS = {}  # register count -> Struct('>nh') unpacking that many signed big-endian registers
+
+def _registers_struct(count):
+    registers = _REGISTERS.get(count)
+    if registers is None:
+        registers = _REGISTERS[count] = struct.Struct(f'>{count}h')
+    return registers
+
 class PressureSensor:
     def __init__(self, port='COM4', baudrate=9600, address=1):
         self.port = port
@@ -70,18 +81,15 @@ class PressureSensor:
                 else:
                     crc >>= 1
         # Return CRC in little-endian format
-        return struct.pack('<H', crc)
+        return _U16_LE.pack(crc)
 
     def build_modbus_request(self, function_code, start_address, register_count_or_value):
         """Build a MODBUS RTU request (for both reading and writing)."""
-        request = struct.pack('>B', self.address)       # Slave address
-        request += struct.pack('>B', function_code)      # Function code
-        request += struct.pack('>H', start_address)      # Start address
-
-        if function_code == 0x03:  # Read request
-            request += struct.pack('>H', register_count_or_value)  # Number of registers to read
-        elif function_code == 0x06:  # Write request
-            request += struct.pack('>H', register_count_or_value)  # Single register value to write
+        # Read request: number of registers to read; write request: single register value to write
+        if function_code in (0x03, 0x06):
+            request = _REQUEST_HEAD.pack(self.address, function_code, start_address, register_count_or_value)
+        else:
+            request = _REQUEST_ADDR.pack(self.address, function_code, start_address)
 
         # CRC16 Calculation
         crc = self.crc16(request)
@@ -133,8 +141,8 @@ class PressureSensor:
             return None
 
         # Validate CRC
-        received_crc = struct.unpack('<H', response[-2:])[0]
-        calculated_crc = struct.unpack('<H', self.crc16(response[:-2]))[0]
+        received_crc = _U16_LE.unpack_from(response, len(response) - 2)[0]
+        calculated_crc = _U16_LE.unpack(self.crc16(response[:-2]))[0]
 
         if received_crc != calculated_crc:
             msg = f"CRC mismatch (received=0x{received_crc:04X}, calculated=0x{calculated_crc:04X})."
@@ -143,12 +151,9 @@ class PressureSensor:
 
         # Extract the data from the response (ignore address and function code)
         byte_count = response[2]
-        values = []
 
-        # Now, use '>h' to unpack as signed 16-bit integers
-        for i in range(0, byte_count, 2):
-            value = struct.unpack('>h', response[3 + i:5 + i])[0]  # Signed 16-bit integer
-            values.append(value)
+        # Unpack all registers as signed 16-bit integers in one call
+        values = list(_registers_struct(byte_count // 2).unpack_from(response, 3))
 
         pressuresensor_logger.debug(
             "Parsed response successfully. Byte count=%d, Values=%s",
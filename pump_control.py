@@ -1,8 +1,8 @@
 import serial
 import struct
-import crcmod
 import time
 import logging
+from array import array
 from PySide6.QtCore import QThread, Signal, QMutex, QMutexLocker
 
 # Configure a logger for the pump device
@@ -12,6 +12,25 @@ pump_handler.setFormatter(logging.Formatter('%(asctime)s - %(levelname)s - %(mes
 pump_logger.addHandler(pump_handler)
 pump_logger.setLevel(logging.INFO)
 
+def _crc16_table():
+    """Build the byte-wise lookup table for the MODBUS CRC-16 (reflected polynomial 0xA001)."""
+    table = array('H')
+    for byte in range(256):
+        crc = byte
+        for _ in range(8):
+            crc = (crc >> 1) ^ 0xA001 if crc & 0x0001 else crc >> 1
+        table.append(crc)
+    return table
+
+CRC16_TABLE = _crc16_table()
+
+def modbus_crc(data, table=CRC16_TABLE):
+    """Calculate the MODBUS CRC-16 of data, one table lookup per byte."""
+    crc = 0xFFFF
+    for byte in data:
+        crc = (crc >> 8) ^ table[(crc ^ byte) & 0xFF]
+    return crc
+
 class PumpControl:
     def __init__(self, port='COM13', baudrate=9600, address=1):
         """Initialize the PumpControl class with serial settings and Modbus address."""
@@ -19,7 +38,6 @@ class PumpControl:
         self.baudrate = baudrate
         self.address = address  # Modbus slave address
         self.ser = None
-        self.crc16 = crcmod.predefined.mkCrcFun('modbus')
         pump_logger.info("PumpControl initialized with port %s, baudrate %d, address %d", port, baudrate, address)
 
     def open_connection(self):
@@ -42,7 +60,7 @@ class PumpControl:
 
     def calculate_crc(self, data):
         """Calculate CRC16 for the Modbus RTU frame."""
-        return self.crc16(data)
+        return modbus_crc(data)
 
     def read_registers(self, start_address, num_registers):
         """Read Modbus holding registers."""
@@ -261,25 +279,26 @@ class PumpControlThread(QThread):
     def run(self):
         """Continuously monitor pump parameters in the background."""
         while self.running:
-            with QMutexLocker(self.mutex):
-                try:
+            try:
+                # Hold the mutex only for the serial transactions, so user commands can slip in
+                # between them; the blocking reads already wait for each reply
+                with QMutexLocker(self.mutex):
                     flow, pressure, stroke = self.pump_control.read_pump_parameters()
-                    cur_time = time.time()
-                    if pressure is not None:
-                        self.pressure_updated.emit(pressure)
-                    if flow is not None:
-                        self.flow_updated.emit(flow, cur_time)
-                    else:
-                        self.flow_updated.emit(-1, cur_time)
-                    if stroke is not None:
-                        self.stroke_updated.emit(stroke)
-                    self.msleep(50)
+                cur_time = time.time()
+                if pressure is not None:
+                    self.pressure_updated.emit(pressure)
+                if flow is not None:
+                    self.flow_updated.emit(flow, cur_time)
+                else:
+                    self.flow_updated.emit(-1, cur_time)
+                if stroke is not None:
+                    self.stroke_updated.emit(stroke)
+                with QMutexLocker(self.mutex):
                     status = self.pump_control.read_pump_status()
-                    if status is not None:
-                        self.status_updated.emit(status)
-                    self.msleep(50)
-                except Exception as e:
-                    print(f"Error reading pump parameters: {e}")
+                if status is not None:
+                    self.status_updated.emit(status)
+            except Exception as e:
+                print(f"Error reading pump parameters: {e}")
             self.msleep(900)  # Poll every second
 
     def set_stroke(self, stroke_value):
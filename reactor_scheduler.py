@@ -0,0 +1,248 @@
+from array import array
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:  # numba is optional, fall back to plain Python
+    def njit(*args, **kwargs):
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return lambda func: func
+
+LEAST_RUNTIME = 'least_runtime'  # Run the reactors with the least accumulated runtime
+ROUND_ROBIN = 'round_robin'  # Run the next reactors in turn, wrapping around
+POLICIES = (LEAST_RUNTIME, ROUND_ROBIN)
+
+# Reactor count for each whole percent (0..100) of available power: one reactor per 10%
+OPERATIONAL_REACTORS_LUT = np.minimum(np.arange(101) // 10, 10).astype(np.int8)
+OPERATIONAL_REACTORS_BYTES = OPERATIONAL_REACTORS_LUT.tobytes()  # Same table for scalar lookups
+
+def operational_reactor_counts(percents):
+    """ Reactor counts for an array of power percentages through OPERATIONAL_REACTORS_LUT.
+
+    Negative percents run no reactors. NaN (an empty resample bin) runs all 10, as it fell
+    through every comparison of the original if/elif ladder.
+    """
+    percents = np.clip(np.nan_to_num(percents, nan=100.0), 0, 100)
+    return OPERATIONAL_REACTORS_LUT[percents.astype(np.intp)]
+
+def reactor_indices(mask):
+    """ Return the reactor indices whose bits are set in mask, in ascending order. """
+    indices = []
+    while mask:
+        low_bit = mask & -mask
+        indices.append(low_bit.bit_length() - 1)
+        mask ^= low_bit
+    return indices
+
+def rotl(x, k, n):
+    """ Rotate the n-bit mask x left by k bits. """
+    return ((x << k) | (x >> (n - k))) & ((1 << n) - 1)
+
+@njit(cache=True)
+def _schedule(counts, reactor_minutes, running_mask, interval):
+    """ Run the least-runtime schedule over a batch of reactor counts.
+
+    Same policy as ReactorScheduler.rebalance_reactors: reactor_minutes is updated in place and
+    the final running bitmask (bit i = reactor i active) is returned.
+    """
+    num_reactors = reactor_minutes.shape[0]
+    num_running = 0
+    for i in range(num_reactors):
+        num_running += (running_mask >> i) & 1
+
+    for num_active in counts:
+        # Deactivate the reactors with the most runtime first (lowest index on ties)
+        while num_running > num_active:
+            pick = -1
+            for i in range(num_reactors):
+                if (running_mask >> i) & 1 and (pick < 0 or reactor_minutes[i] > reactor_minutes[pick]):
+                    pick = i
+            running_mask &= ~(1 << pick)
+            num_running -= 1
+
+        # Activate the reactors with the least runtime first (lowest index on ties)
+        while num_running < num_active:
+            pick = -1
+            for i in range(num_reactors):
+                if not (running_mask >> i) & 1 and (pick < 0 or reactor_minutes[i] < reactor_minutes[pick]):
+                    pick = i
+            running_mask |= 1 << pick
+            num_running += 1
+
+        for i in range(num_reactors):
+            if (running_mask >> i) & 1:
+                reactor_minutes[i] += interval
+
+    return running_mask
+
+class ReactorScheduler:
+    """ Decides how many reactors run on each interval of available power, and which ones.
+
+    policy selects the reactors: LEAST_RUNTIME balances the accumulated runtime, ROUND_ROBIN
+    takes the next reactors in turn. power_ratio scales the 10% power step per reactor.
+    """
+    # Fixed attribute layout: the scheduler is rebuilt for every x during find_best_x
+    # and touched on every interval, so avoid a per-instance __dict__
+    __slots__ = ('num_reactors', 'max_power', '_reactor_minutes', 'interval', 'running_reactors',
+                 'total_energy_consumed', 'running_reactors_his', 'relays_to_oc', 'V_variation',
+                 'track_history', '_energy_per_reactor_step', 'policy', 'power_ratio', 'current_index',
+                 'lightweight')
+
+    def __init__(self, num_reactors, interval, max_power, track_history=True, policy=LEAST_RUNTIME,
+                 power_ratio=1.0, lightweight=False):
+        if policy not in POLICIES:
+            raise ValueError(f"Unknown scheduling policy {policy!r}, expected one of {POLICIES}")
+        self.policy = policy
+        self.power_ratio = power_ratio  # e.g. max power ratio of a reference day to the current day
+        self.current_index = 0  # Next reactor in turn for ROUND_ROBIN
+        self.num_reactors = num_reactors
+        self.max_power = max_power  # Maximum available power
+        self.reactor_minutes = np.zeros(num_reactors, dtype=np.int64)  # Track reactor time in minutes
+        self.interval = interval  # Set the interval dynamically
+        self.running_reactors = 0  # Bitmask of currently active reactors (bit i = reactor i)
+        self.total_energy_consumed = 0  # Total energy consumed by reactors
+        self._energy_per_reactor_step = 0.1 * max_power * (interval / 60)  # Energy of one reactor over one interval
+        self.track_history = track_history  # Disable for throwaway schedulers (e.g. parameter searches)
+        # Only accumulate total_energy_consumed, for schedulers that just score an efficiency
+        self.lightweight = lightweight
+        self.running_reactors_his = array('b') # Store the number of running reactors for each interval
+        self.relays_to_oc = None  # Track the relays to open/close
+        self.V_variation = 1.0  # Voltage variation correction factor
+
+    @property
+    def reactor_minutes(self):
+        """ Accumulated runtime of each reactor in minutes, as an int64 array. """
+        return self._reactor_minutes
+
+    @reactor_minutes.setter
+    def reactor_minutes(self, minutes):
+        # Keep a contiguous int64 array whatever is assigned (e.g. a list of restored runtimes),
+        # since the argpartition keys and the compiled kernel update it in place
+        minutes = np.ascontiguousarray(minutes, dtype=np.int64)
+        if minutes.shape != (self.num_reactors,):
+            raise ValueError(f"Expected {self.num_reactors} reactor runtimes, got shape {minutes.shape}")
+        self._reactor_minutes = minutes
+    
+    def get_operational_reactors(self, available_power):
+        """ Adjust the number of reactors to run based on the available power percentage.
+
+        NaN power runs all 10 reactors, like the original if/elif ladder.
+        """
+        # One reactor per 10% step of the (voltage corrected) available power, clamped to 0..10
+        percent = available_power / (self.V_variation * self.power_ratio)
+        if percent != percent:  # NaN
+            return 10
+        if percent < 0:
+            return 0
+        return OPERATIONAL_REACTORS_BYTES[int(min(percent, 100))]
+
+    def get_operational_reactors_batch(self, power_readings):
+        """ Vectorized get_operational_reactors over an array of power percentages. """
+        # Table lookup on the whole (voltage corrected) percent instead of a floor-divide and clip
+        percents = np.asarray(power_readings, dtype=np.float64) / (self.V_variation * self.power_ratio)
+        return operational_reactor_counts(percents)
+
+    def rebalance_reactors(self, num_active_reactors):
+        """ Bring running_reactors to num_active_reactors according to the scheduling policy. """
+        n = self.num_reactors
+        if self.policy == ROUND_ROBIN:
+            # The next num_active_reactors reactors from current_index, wrapping around
+            self.running_reactors = rotl((1 << num_active_reactors) - 1, self.current_index, n)
+            self.current_index = (self.current_index + num_active_reactors) % n
+            return
+
+        mask = self.running_reactors
+        num_running = mask.bit_count()
+        if num_active_reactors < num_running:
+            # Deactivate reactors with the most runtime first (lowest index on ties)
+            k = num_running - num_active_reactors
+            running = np.array(reactor_indices(mask), dtype=np.intp)
+            keys = self.reactor_minutes[running] * n + (n - 1 - running)
+            for reactor_index in running[np.argpartition(keys, -k)[-k:]].tolist():
+                mask &= ~(1 << reactor_index)
+
+        elif num_active_reactors > num_running:
+            # Activate reactors with the least runtime first (lowest index on ties)
+            k = num_active_reactors - num_running
+            idle = np.array(reactor_indices(~mask & ((1 << n) - 1)), dtype=np.intp)
+            keys = self.reactor_minutes[idle] * n + idle
+            if k < len(idle):
+                idle = idle[np.argpartition(keys, k - 1)[:k]]
+            for reactor_index in idle.tolist():
+                mask |= 1 << reactor_index
+
+        self.running_reactors = mask
+
+    def update_reactor_minutes(self, num_active_reactors):
+        self.total_energy_consumed += num_active_reactors * self._energy_per_reactor_step  # Add energy consumed
+        if not self.lightweight:
+            self.step_reactors(num_active_reactors)
+
+    def step_reactors(self, num_active_reactors):
+        """ Advance one interval with num_active_reactors running; energy is accounted by the caller. """
+        self.rebalance_reactors(num_active_reactors)
+
+        # Update runtime for active reactors
+        self.reactor_minutes += self.interval * ((self.running_reactors >> np.arange(self.num_reactors)) & 1)
+        
+        if self.track_history:
+            self.running_reactors_his.append(num_active_reactors)  # Track the number of running reactors for plotting
+
+    def schedule_reactors(self, power_readings):
+        """ Schedule reactors based on available power """
+        counts = self.get_operational_reactors_batch(power_readings)
+        # Energy is linear in the reactor counts, so account for the whole batch in one reduction
+        self.total_energy_consumed += int(counts.sum(dtype=np.int64)) * self._energy_per_reactor_step
+        if self.lightweight:
+            return
+
+        # Only the reactor selection depends on the order of the samples
+        if self.policy == LEAST_RUNTIME:
+            # Run it in one compiled pass
+            self.running_reactors = int(_schedule(counts, self.reactor_minutes, self.running_reactors,
+                                                  self.interval))
+            if self.track_history:
+                self.running_reactors_his.frombytes(counts.tobytes())  # counts are int8, same as the 'b' array
+        else:
+            for num_active_reactors in counts.tolist():
+                self.step_reactors(num_active_reactors)
+
+    def step(self, available_power):
+        """ Schedule one interval of available power and return the running reactor bitmask. """
+        self.update_reactor_minutes(self.get_operational_reactors(available_power))
+        return self.running_reactors
+
+    def calculate_efficiency(self, total_solar_power):
+        if total_solar_power == 0:
+            return 0
+        efficiency = self.total_energy_consumed / total_solar_power
+        return efficiency
+    
+    def print_runtime_distribution(self):
+        """ Optional: Print runtime distribution for debugging or analysis """
+        print("Reactor Runtime Distribution:", self.reactor_minutes)
+    
+    def schedule_reactors_v2(self, power_readings):
+        """ Schedule reactors based on available power """
+        num_active_reactors = 0
+        for num_active_reactors in self.get_operational_reactors_batch(power_readings).tolist():
+            self.update_reactor_minutes_v2(num_active_reactors)
+        return num_active_reactors
+
+    def update_reactor_minutes_v2(self, num_active_reactors):
+        self.total_energy_consumed += num_active_reactors * self._energy_per_reactor_step  # Add energy consumed
+        self.rebalance_reactors(num_active_reactors)
+
+        # Update runtime for active reactors; relay i follows reactor bit i
+        mask = self.running_reactors
+        self.reactor_minutes += self.interval * ((mask >> np.arange(self.num_reactors)) & 1)
+        self.relays_to_oc = np.unpackbits(np.array([mask & 0xFF, (mask >> 8) & 0xFF], dtype=np.uint8),
+                                          bitorder='little').tolist()
+        
+        if self.track_history:
+            self.running_reactors_his.append(num_active_reactors)
+    
+    def modify_V_variation(self, voltage_init, voltage_cur):
+        self.V_variation = voltage_cur / voltage_init
+        return self.V_variation
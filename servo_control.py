@@ -1,7 +1,7 @@
 import logging
 from logging.handlers import RotatingFileHandler
 from scservo_sdk import *  # Import SCServo SDK library
-from PySide6.QtCore import QObject, Signal, QMutex, QMutexLocker, QTimer, QThread
+from PySide6.QtCore import QObject, Signal, QMutex, QMutexLocker, QTimer
 import os
 import gzip
 import shutil
@@ -39,7 +39,6 @@ class ServoWorker(QObject):
     # ----------------------
     #        SIGNALS
     # ----------------------
-    position_updated = Signal(int, int, int, int, int)  # Signal to update the GUI (servo_id, pos, speed, temp)
     write_position_signal = Signal(int, int)        # Signal to request a position write (servo_id, position)
     disable_torque_signal = Signal(int)            # Signal to request torque disable (servo_id)
     inter_open = Signal(int)
@@ -54,6 +53,16 @@ class ServoWorker(QObject):
     button_checked_distorque_close = Signal(int)
     button_checked_distorque_open = Signal(int)
 
+    # Batched variants: one emit per reactor transition, acknowledged once all servos are done
+    button_checked_close_batch = Signal(list)
+    button_checked_open_batch = Signal(list)
+    button_checked_distorque_close_batch = Signal(list)
+    button_checked_distorque_open_batch = Signal(list)
+    inter_close_batch = Signal(list)
+    inter_open_batch = Signal(list)
+    tor_close_batch = Signal(list)
+    tor_open_batch = Signal(list)
+
     # ----------------------
     #        INIT
     # ----------------------
@@ -69,6 +78,12 @@ class ServoWorker(QObject):
         self.running = True
         self.servos_pos = {scs_id: 0 for scs_id in servos.keys()}
         self.servos_load = {scs_id: 0 for scs_id in servos.keys()}
+        self.state_mutex = QMutex()  # Guards latest_states only, so the GUI never waits on serial I/O
+        self.latest_states = {}  # servo_id -> (pos, speed, load, temp) polled since the GUI last took them
+        # One Sync Read of position..temperature (8 bytes from SMS_STS_PRESENT_POSITION_L) for every servo
+        packet_handler = next(iter(servos.values())).packetHandler
+        self.sync_read = GroupSyncRead(packet_handler, SMS_STS_PRESENT_POSITION_L, 8)
+        self._pending = {}  # servo_id -> goal position, sent as one Sync Write packet by _flush_sync_write
 
         # Connect signals to their respective slots
         self.write_position_signal.connect(self.write_position)
@@ -102,7 +117,7 @@ class ServoWorker(QObject):
 
     def poll_servos(self):
         """
-        Poll each servo for its current state and emit signals to update the GUI.
+        Poll every servo's state with one Sync Read and publish it for the GUI.
         """
         # print(self.servos_pos)
         if not self.running:
@@ -110,16 +125,19 @@ class ServoWorker(QObject):
             self.poll_timer.stop()
             servo_logger.info("ServoWorker is stopping.")
             return
-        
-        QThread.msleep(50)
 
         with QMutexLocker(self.mutex):
+            sync_states = self.sync_read_all()
             for scs_id, servo in self.servos.items():
                 try:
-                    pos, speed, load, volt, temp = servo.read_all()
+                    if scs_id in sync_states:
+                        pos, speed, load, volt, temp = sync_states[scs_id]
+                    else:  # No clean Sync Read reply from this servo; fall back to a direct read
+                        pos, speed, load, volt, temp = servo.read_all()
                     self.servos_pos[scs_id] = pos
                     self.servos_load[scs_id] = load
-                    self.position_updated.emit(scs_id, pos, speed, load, temp)
+                    with QMutexLocker(self.state_mutex):
+                        self.latest_states[scs_id] = (pos, speed, load, temp)
                     # if pos > 3000 and load != 0:
                     #     self.inter_close.emit(scs_id, pos)
                     # elif pos < 2200 and load != 0:
@@ -127,8 +145,43 @@ class ServoWorker(QObject):
                     servo_logger.info("Polled Servo %d: Position=%d, Speed=%d, Load=%d, Temp=%d°C", scs_id, pos, speed, load, temp)
                 except Exception as e:
                     servo_logger.error("Error reading data from servo %d: %s", scs_id, str(e))
-        
-        QThread.msleep(50)
+
+    def sync_read_all(self):
+        """
+        Read position, speed, load, voltage and temperature from every servo with one Sync Read packet.
+        Called with self.mutex held. Returns {servo_id: (pos, speed, load, volt, temp)} for the servos
+        whose reply arrived intact and without an error flag.
+        """
+        group = self.sync_read
+        ph = group.ph
+        group.clearParam()  # Fresh params each poll so a missing reply never reuses last poll's data
+        for scs_id in self.servos:
+            group.addParam(scs_id)
+        scs_comm_result = group.txRxPacket()
+        if scs_comm_result != COMM_SUCCESS:
+            servo_logger.warning("Sync Read incomplete: %s", ph.getTxRxResult(scs_comm_result))
+
+        states = {}
+        for scs_id in self.servos:
+            available, scs_error = group.isAvailable(scs_id, SMS_STS_PRESENT_POSITION_L, 8)
+            if available and scs_error == 0:
+                states[scs_id] = (
+                    ph.scs_tohost(group.getData(scs_id, SMS_STS_PRESENT_POSITION_L, 2), 15),
+                    ph.scs_tohost(group.getData(scs_id, SMS_STS_PRESENT_SPEED_L, 2), 15),
+                    ph.scs_tohost(group.getData(scs_id, SMS_STS_PRESENT_LOAD_L, 2), 15),
+                    group.getData(scs_id, SMS_STS_PRESENT_VOLTAGE, 1),
+                    group.getData(scs_id, SMS_STS_PRESENT_TEMPERATURE, 1),
+                )
+        return states
+
+    def take_states(self):
+        """
+        Return the servo states polled since the last call and clear them.
+        Called from the GUI thread's refresh timer instead of receiving one queued signal per servo per poll.
+        """
+        with QMutexLocker(self.state_mutex):
+            states, self.latest_states = self.latest_states, {}
+        return states
 
     # ----------------------
     #        STOP
@@ -178,11 +231,7 @@ class ServoWorker(QObject):
     
     def write_position_checked_close(self, servo_id):
         with QMutexLocker(self.mutex):
-            try:
-                self.servos[servo_id].write_position(3100)
-                servo_logger.info("Sent write_position to Servo %d: Position=3100", servo_id)
-            except Exception as e:
-                servo_logger.error("Error writing position to servo %d: %s", servo_id, str(e))
+            self._queue_position(servo_id, 3100)
         # Check the servo positin and resend command if necessary
         QTimer.singleShot(3500, lambda: self.check_position_close(servo_id))
 
@@ -193,20 +242,13 @@ class ServoWorker(QObject):
                 return
             else:
                 print("Servo position does not match the desired position. Resending command.")
-                try:
-                    self.servos[servo_id].write_position(3100)
-                except Exception as e:
-                    print(f"Error writing position to servo {servo_id}: {e}")
+                self._queue_position(servo_id, 3100)
                 
                 QTimer.singleShot(1000, lambda: self.check_position_close(servo_id))
     
     def write_position_checked_open(self, servo_id):
         with QMutexLocker(self.mutex):
-            try:
-                self.servos[servo_id].write_position(2030)
-                servo_logger.info("Sent write_position to Servo %d: Position=2030", servo_id)
-            except Exception as e:
-                servo_logger.error("Error writing position to servo %d: %s", servo_id, str(e))
+            self._queue_position(servo_id, 2030)
         # Check the servo positin and resend command if necessary
         QTimer.singleShot(3500, lambda: self.check_position_open(servo_id))
 
@@ -217,10 +259,7 @@ class ServoWorker(QObject):
                 return
             else:
                 print("Servo position does not match the desired position. Resending command.")
-                try:
-                    self.servos[servo_id].write_position(2030)
-                except Exception as e:
-                    print(f"Error writing position to servo {servo_id}: {e}")
+                self._queue_position(servo_id, 2030)
                 
                 QTimer.singleShot(1000, lambda: self.check_position_open(servo_id))
 
@@ -272,6 +311,94 @@ class ServoWorker(QObject):
                 
                 QTimer.singleShot(1000, lambda: self.check_torque_open(servo_id))
 
+    # ----------------------
+    #   SYNC WRITE
+    # ----------------------
+    def _queue_position(self, servo_id, position):
+        """
+        Queue a goal position; every position queued within 20 ms goes out in one Sync Write packet.
+        Called with self.mutex held.
+        """
+        if not self._pending:
+            QTimer.singleShot(20, self._flush_sync_write)
+        self._pending[servo_id] = position
+
+    def _flush_sync_write(self):
+        """
+        Send every queued goal position as one broadcast Sync Write packet per shared packet handler.
+        Sync Write gets no status reply, so the checked commands confirm the move from polled positions.
+        """
+        with QMutexLocker(self.mutex):
+            pending, self._pending = self._pending, {}
+            packet_handlers = {}
+            for scs_id, position in pending.items():
+                servo = self.servos[scs_id]
+                try:
+                    servo.add_sync_position(position)
+                    packet_handlers[id(servo.packetHandler)] = servo.packetHandler
+                except Exception as e:
+                    servo_logger.error("Error queuing position for servo %d: %s", scs_id, str(e))
+            for packet_handler in packet_handlers.values():
+                try:
+                    scs_comm_result = packet_handler.groupSyncWrite.txPacket()
+                    if scs_comm_result != COMM_SUCCESS:
+                        servo_logger.error("Error sending Sync Write: %s", packet_handler.getTxRxResult(scs_comm_result))
+                finally:
+                    packet_handler.groupSyncWrite.clearParam()
+            servo_logger.info("Sent Sync Write positions: %s", pending)
+
+    # ----------------------
+    #   BATCHED COMMANDS
+    # ----------------------
+    def write_position_checked_close_batch(self, servo_ids):
+        self._run_checked_batch(servo_ids, lambda scs_id: self._queue_position(scs_id, 3100),
+                                lambda scs_id: self.servos_pos[scs_id] >= 3000, self.inter_close_batch, 3500)
+
+    def write_position_checked_open_batch(self, servo_ids):
+        self._run_checked_batch(servo_ids, lambda scs_id: self._queue_position(scs_id, 2030),
+                                lambda scs_id: self.servos_pos[scs_id] <= 2200, self.inter_open_batch, 3500)
+
+    def disable_torque_checked_close_batch(self, servo_ids):
+        self._run_checked_batch(servo_ids, lambda scs_id: self.servos[scs_id].write_torque_disable(),
+                                lambda scs_id: self.servos_load[scs_id] == 0, self.tor_close_batch, 1000)
+
+    def disable_torque_checked_open_batch(self, servo_ids):
+        self._run_checked_batch(servo_ids, lambda scs_id: self.servos[scs_id].write_torque_disable(),
+                                lambda scs_id: self.servos_load[scs_id] == 0, self.tor_open_batch, 1000)
+
+    def _run_checked_batch(self, servo_ids, command, is_done, done_signal, check_delay_ms):
+        """
+        Send command to every servo in servo_ids, then re-check until all of them report done.
+
+        :param command: Callable taking a servo_id that sends the command
+        :param is_done: Callable taking a servo_id that tells whether the command took effect
+        :param done_signal: Signal(list) emitted once with servo_ids when every servo is done
+        """
+        servo_ids = list(servo_ids)
+        with QMutexLocker(self.mutex):
+            for scs_id in servo_ids:
+                try:
+                    command(scs_id)
+                    servo_logger.info("Sent batched command to Servo %d", scs_id)
+                except Exception as e:
+                    servo_logger.error("Error sending command to servo %d: %s", scs_id, str(e))
+        QTimer.singleShot(check_delay_ms, lambda: self._check_batch(servo_ids, servo_ids, command, is_done, done_signal))
+
+    def _check_batch(self, servo_ids, pending, command, is_done, done_signal):
+        with QMutexLocker(self.mutex):
+            pending = [scs_id for scs_id in pending if not is_done(scs_id)]
+            if not pending:
+                done_signal.emit(servo_ids)
+                return
+            servo_logger.warning("Servos %s did not reach the desired state. Resending command.", pending)
+            for scs_id in pending:
+                try:
+                    command(scs_id)
+                except Exception as e:
+                    servo_logger.error("Error sending command to servo %d: %s", scs_id, str(e))
+
+        QTimer.singleShot(1000, lambda: self._check_batch(servo_ids, pending, command, is_done, done_signal))
+
 
 class ServoControl:
     def __init__(self, scs_id, port_handler, packet_handler,
@@ -295,6 +422,11 @@ class ServoControl:
         elif scs_error != 0:
             raise Exception(f"Servo Error: {self.packetHandler.getRxPacketError(scs_error)}")
 
+    def add_sync_position(self, position):
+        """Add the goal position to the shared packet handler's Sync Write packet; it is sent by groupSyncWrite.txPacket()."""
+        if not self.packetHandler.SyncWritePosEx(self.SCS_ID, position, self.SCS_MOVING_SPEED, self.SCS_MOVING_ACC):
+            raise Exception(f"Sync Write parameter rejected for servo {self.SCS_ID}")
+
     def read_position_and_speed(self):
         """Read the current position and speed of the servo."""
         scs_present_position, scs_present_speed, scs_comm_result, scs_error = self.packetHandler.ReadPosSpeed(self.SCS_ID)
@@ -0,0 +1,19 @@
+import pandas as pd
+import numpy as np
+
+SOLAR_TIMESTAMP_FORMAT = '%Y-%m-%d %H:%M:%S'  # TIMESTAMP column of the solar CSVs
+
+def read_solar_data(filepath, interval_minutes):
+    """ Read the DC power column of a solar CSV, resampled to interval_minutes means.
+
+    Returns the resampled power as a numpy array (NaN for empty bins) and its maximum.
+    """
+    # Only the timestamp and DC power columns are needed; parse them straight into a time index
+    data = pd.read_csv(filepath, usecols=['TIMESTAMP', 'InvPDC_kW_Avg'], parse_dates=['TIMESTAMP'],
+                       index_col='TIMESTAMP', dtype={'InvPDC_kW_Avg': np.float32}, engine='c',
+                       date_format=SOLAR_TIMESTAMP_FORMAT)
+    if not isinstance(data.index, pd.DatetimeIndex):
+        # pandas leaves the column unparsed when the file uses another timestamp format
+        data.index = pd.to_datetime(data.index)
+    resampled = data['InvPDC_kW_Avg'].resample(f'{interval_minutes}min').mean()
+    return resampled.to_numpy(), float(resampled.max())
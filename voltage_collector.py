@@ -1,5 +1,6 @@
 import serial
 import struct
+import numpy as np
 import time
 import logging
 from PySide6.QtCore import QThread, Signal, QObject, QTimer, QMutex, QMutexLocker
@@ -18,6 +19,8 @@ voltage_handler.setFormatter(formatter)
 voltage_logger.addHandler(voltage_handler)
 voltage_logger.setLevel(logging.INFO)
 
+VOLTAGE_REGISTERS = struct.Struct('>12h')  # The 12 signed registers of a read reply, after the 3 header bytes
+
 class VoltageCollector:
     def __init__(self, port='COM7', baudrate=115200):
         self.port = port
@@ -54,7 +57,8 @@ class VoltageCollector:
                 parity=serial.PARITY_NONE,
                 stopbits=serial.STOPBITS_ONE,
                 bytesize=serial.EIGHTBITS,
-                timeout=1
+                timeout=1,  # Upper bound on a reply; read() returns as soon as the 29 bytes arrive
+                inter_byte_timeout=0.02  # A gap this long inside a reply means the frame has ended
             )
             voltage_logger.info("Opened connection on port %s", self.port)
         except serial.SerialException as e:
@@ -75,18 +79,12 @@ class VoltageCollector:
         self.ser.write(self.command)
         voltage_logger.info("Sent read command to voltage collector.")
 
-        # Add delay to allow sensor time to process the command
-        time.sleep(0.05)  # 50 ms delay
-
         # Read the response (12 registers * 2 bytes each + 5 overhead bytes)
         response = self.ser.read(29)  # Expecting 29 bytes in response
 
-        voltages = []
         if len(response) == 29:
-            for i in range(12):
-                voltage_raw = int.from_bytes(response[3 + 2 * i:5 + 2 * i], byteorder='big', signed=True)
-                voltage = voltage_raw * 30 / 10000 * (-1)  # Scale according to the 30V range
-                voltages.append(voltage)
+            # All 12 signed big-endian registers in one unpack, scaled to the 30V range
+            voltages = [voltage_raw * 30 / 10000 * (-1) for voltage_raw in VOLTAGE_REGISTERS.unpack_from(response, 3)]
             voltage_logger.info("Read voltages: %s", voltages[:11])
             voltages[5] = voltages[10]  # Channel 6 is damaged, so we replace it with channel 11
             # voltages = [-1*i for i in voltages]
@@ -100,8 +98,11 @@ class VoltageCollectorWorker(QObject):
     #        SIGNALS
     # ----------------------
     voltages_updated = Signal(list, float)  # Signal to send the voltage data to the GUI
+    voltages_batch_updated = Signal(object, object)  # (samples, channels) voltages and their timestamps, BATCH_SIZE at a time
     stopped = Signal()  # Signal to indicate that the worker has stopped
 
+    BATCH_SIZE = 5  # Samples per batch; at 1 Hz, one batch per DataUpdateWorker plot period
+
     # ----------------------
     #        INIT
     # ----------------------
@@ -118,6 +119,9 @@ class VoltageCollectorWorker(QObject):
         self.mutex = QMutex()
         self.timer = None
         self.cur_voltages = None
+        self.batch = None  # Created on the first sample, once the channel count is known
+        self.batch_times = np.empty(self.BATCH_SIZE)
+        self.batch_count = 0
 
     # ----------------------
     #   START COLLECTING
@@ -140,6 +144,7 @@ class VoltageCollectorWorker(QObject):
         Stop the voltage collection process by stopping the QTimer.
         """
         self.running = False
+        self.flush_batch()  # Hand over the samples of the last, partial batch
 
     # ----------------------
     #   COLLECT VOLTAGE
@@ -157,5 +162,32 @@ class VoltageCollectorWorker(QObject):
                 voltages = self.voltage_collector.read_voltages()
                 cur_time = time.time()
                 self.voltages_updated.emit(voltages, cur_time)
+                if voltages is not None:
+                    self.add_to_batch(voltages, cur_time)
             except Exception as e:
                 print(f"Error reading voltages: {e}")
+
+    # ----------------------
+    #   BATCHED SAMPLES
+    # ----------------------
+    def add_to_batch(self, voltages, cur_time):
+        """
+        Accumulate one sample and emit voltages_batch_updated once BATCH_SIZE samples are in,
+        so consumers of the history take one queued call per batch instead of one per sample.
+        """
+        if self.batch is None:
+            self.batch = np.empty((self.BATCH_SIZE, len(voltages)))
+        self.batch[self.batch_count] = voltages
+        self.batch_times[self.batch_count] = cur_time
+        self.batch_count += 1
+        if self.batch_count == self.BATCH_SIZE:
+            self.flush_batch()
+
+    def flush_batch(self):
+        """Emit the accumulated samples; new buffers are started since the emitted ones now belong to the receiver."""
+        if not self.batch_count:
+            return
+        self.voltages_batch_updated.emit(self.batch[:self.batch_count], self.batch_times[:self.batch_count])
+        self.batch = np.empty_like(self.batch)
+        self.batch_times = np.empty_like(self.batch_times)
+        self.batch_count = 0